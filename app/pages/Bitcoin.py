@@ -4,92 +4,24 @@
 # Standard library
 import os
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
 # Third-party libraries
 import numpy as np
+import orjson
 import pandas as pd
 import requests
-import altair as alt
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import streamlit as st
+from ui import asset, inject_css, submit
 
 # --- Page config ---
 st.set_page_config(page_title="Bitcoin Dashboard", page_icon="₿", layout="wide")
 
-st.markdown("""
-<style>
-/* Body & background */
-body {
-    background: linear-gradient(135deg, #1f1c2c, #282843);
-    color: #f0f0f0;
-}
-
-/* Fonts */
-h1, h2, h3 {
-    font-family: 'Poppins', sans-serif;
-}
-p {
-    font-family: 'Roboto', sans-serif;
-    font-size: 1rem;
-    line-height: 1.5rem;
-}
-
-/* Crypto cards */
-.crypto-card {
-    border-radius: 20px;
-    box-shadow: 0 10px 25px rgba(0,0,0,0.4);
-    transition: transform 0.2s;
-    text-align: center;
-    background-color: #2a2a3e;
-    padding: 15px;
-    margin-bottom: 20px;
-}
-.crypto-card:hover {
-    transform: scale(1.05);
-}
-
-/* Images hover effect */
-.crypto-card img {
-    border-radius: 15px;
-    transition: transform 0.3s ease-in-out;
-}
-.crypto-card img:hover {
-    transform: scale(1.05);
-}
-
-/* Buttons */
-.stButton>button {
-    background: linear-gradient(45deg, #ff9900, #ff6600);
-    color: white;
-    font-weight: bold;
-    border-radius: 12px;
-    padding: 8px 16px;
-    transition: all 0.3s ease;
-    width: 100%;
-}
-.stButton>button:hover {
-    transform: translateY(-3px);
-    box-shadow: 0 5px 15px rgba(255, 153, 0, 0.6);
-}
-
-/* Section header */
-.section-header {
-    background-color: #3a3a55;
-    padding: 20px;
-    border-radius: 15px;
-    margin-bottom: 25px;
-    text-align: center;
-}
-.section-header h2 {
-    color: #ff9900;
-    margin: 0;
-}
-.section-header p {
-    color: #ffffff;
-    margin: 5px 0 0 0;
-}
-</style>
-""", unsafe_allow_html=True)
+inject_css("dashboard.css")
 
 
 
@@ -107,8 +39,7 @@ st.markdown('<div class="section-header"><h2>Bitcoin Dashboard</h2><p>World’s
 
 col1, col2, col3 = st.columns([1, 1, 1])
 with col2:
-    bit = os.path.join(APP_DIR, "assets", "btc.png")
-    st.image(bit)
+    st.markdown(f'<img src="{asset("btc.png")}" style="max-width:100%">', unsafe_allow_html=True)
 
 
 # %%
@@ -120,46 +51,99 @@ It remains the most valuable and widely recognized cryptocurrency, often describ
 **digital gold** due to its limited supply of 21 million coins.
 """)
 
-st.markdown("---")
+st.divider()
 
 # --- Current UTC time and explanation ---
 
-# Get current UTC time and date
-utc_now = datetime.now(timezone.utc)
-utc_time = utc_now.strftime("%H:%M:%S")
-utc_date = utc_now.strftime("%Y-%m-%d")
+# Clock runs as its own fragment (ticks every second) so it never reruns the rest of the page
+@st.experimental_fragment(run_every=1)
+def clock_block():
+    utc_now = datetime.now(timezone.utc)
+    st.markdown(f"### 🕒 Current UTC Time:  {utc_now:%H:%M:%S}")
+    st.markdown(f"**Date:** {utc_now:%Y-%m-%d}")
 
-# Display clock and info
-st.markdown(f"### 🕒 Current UTC Time:  {utc_time}")
-st.markdown(f"**Date:** {utc_date}")
-if st.button("🔄 Refresh Time"):
-    st.rerun()
+clock_block()
 
 st.caption(
     "All timestamps and data on this dashboard are displayed in **Coordinated Universal Time (UTC)** "
     "to match the format provided by the CoinGecko API."
 )
 
-st.markdown("---")
+st.divider()
 
 
 # --- Step 1: Fetch and prepare Kraken OHLC data (daily, last N days) ---
 
-@st.cache_data(ttl=3600)  # cache for 1 hour (Kraken is stable; reduces API hits)
+@st.cache_resource(show_spinner=False)
+def _http():
+    """
+    Shared keep-alive session for Kraken and the FastAPI model; retries on rate-limit,
+    cold-start and gateway errors reuse the open connection. raise_on_status=False hands
+    the last 5xx back to the caller so it can show the status/body.
+    """
+    s = requests.Session()
+    retry = Retry(total=2, backoff_factor=1.5, status_forcelist=[429, 502, 503, 504, 524],
+                  allowed_methods=["GET"], raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=retry)
+    s.mount("https://", adapter)
+    return s
+
+@st.cache_resource
+def _pool():
+    return ThreadPoolExecutor(max_workers=2)
+
+@st.cache_data(ttl=120, show_spinner=False)  # refresh often; ticker is live
+def get_kraken_ticker(pair: str = "XXBTZUSD"):
+    """
+    Kraken Ticker returns last price and 24h stats.
+    Fields: 'c' (last), 'v' (vol today, vol 24h), 'p' (vwap today, vwap 24h),
+            'h' (high today, high 24h), 'l' (low today, low 24h), 'o' (today open).
+    """
+    r = _http().get("https://api.kraken.com/0/public/Ticker", params={"pair": pair}, timeout=15)
+    r.raise_for_status()
+    payload = orjson.loads(r.content)
+    if payload.get("error"):
+        raise RuntimeError(", ".join(payload["error"]))
+    key = next(iter(payload["result"].keys()))
+    t = payload["result"][key]
+    return {
+        "last": float(t["c"][0]),      # last traded price (USD)
+        "vol_24h": float(t["v"][1]),   # volume over the last 24h (BTC)
+        "vwap_24h": float(t["p"][1]),  # volume-weighted avg price over the last 24h (USD)
+        "open_today": float(t["o"]),   # today's opening price (USD)
+        "ts_utc": datetime.now(timezone.utc),
+    }
+
+# On-disk copy of the last OHLC fetch, so a freshly started server can skip the Kraken round-trip
+# (same cache dir as the Solana page's CoinGecko responses)
+CACHE_DIR = os.getenv("CG_CACHE_DIR", os.path.join(APP_DIR, ".cache"))
+OHLC_TTL = 3600
+
+def _ohlc_disk_path(pair: str, interval: int, days: int) -> str:
+    return os.path.join(CACHE_DIR, f"kraken_ohlc_{pair}_{interval}_{days}.parquet")
+
+@st.cache_data(ttl=OHLC_TTL)  # cache for 1 hour (Kraken is stable; reduces API hits)
 def get_kraken_ohlc(days: int = 90, pair: str = "XXBTZUSD", interval: int = 1440):
     """
     Fetch daily OHLC for Bitcoin from Kraken.
     - pair: "XXBTZUSD" = BTC/USD on Kraken
     - interval: 1440 = 1 day candles
-    Returns DataFrame: timestamp (UTC), open, high, low, close, volume.
+    Returns DataFrame: timestamp (UTC), date, open, high, low, close, volume.
     """
     url = "https://api.kraken.com/0/public/OHLC"
     params = {"pair": pair, "interval": interval}
 
+    path = _ohlc_disk_path(pair, interval, days)
+    try:
+        if time.time() - os.path.getmtime(path) < OHLC_TTL:
+            return pd.read_parquet(path, dtype_backend="pyarrow")
+    except (OSError, ValueError):
+        pass  # missing/stale/unreadable -> fetch
+
     try:
-        r = requests.get(url, params=params, timeout=20)
+        r = _http().get(url, params=params, timeout=20)
         r.raise_for_status()
-        payload = r.json()
+        payload = orjson.loads(r.content)
 
         if payload.get("error"):
             raise RuntimeError(", ".join(payload["error"]))
@@ -167,29 +151,51 @@ def get_kraken_ohlc(days: int = 90, pair: str = "XXBTZUSD", interval: int = 1440
         key = next(iter(payload["result"].keys()))
         rows = payload["result"][key]
 
-        df = pd.DataFrame(
-            rows,
-            columns=["ts", "open", "high", "low", "close", "vwap", "volume", "count"]
-        )
-        # Convert ts → datetime UTC
-        df["timestamp"] = pd.to_datetime(df["ts"], unit="s", utc=True)
-        df = df.sort_values("timestamp").reset_index(drop=True)
-
-        # Convert numeric columns to float (skip timestamp)
-        for col in ["open", "high", "low", "close", "vwap", "volume", "count"]:
-            df[col] = df[col].astype(float)
+        # Rows are [ts, open, high, low, close, vwap, volume, count] with prices as strings:
+        # one vectorized cast for the whole block instead of a per-column astype loop
+        num = np.asarray(rows, dtype=object)[:, :8].astype(np.float64)
+        df = pd.DataFrame({
+            "timestamp": pd.to_datetime(num[:, 0].astype(np.int64), unit="s", utc=True),
+            "open": num[:, 1],
+            "high": num[:, 2],
+            "low": num[:, 3],
+            "close": num[:, 4],
+            "volume": num[:, 6],
+        })
+        if not df["timestamp"].is_monotonic_increasing:
+            df = df.sort_values("timestamp").reset_index(drop=True)
 
         # Keep only last N days
         if days and len(df) > days:
             df = df.tail(days).reset_index(drop=True)
 
-        return df[["timestamp", "open", "high", "low", "close", "volume"]]
+        # Calendar date for the charts/table, computed once here instead of on every rerun
+        df["date"] = df["timestamp"].dt.date
+
+        # Arrow-backed columns: st.dataframe / st.vega_lite_chart hand them over without re-encoding
+        df = df[["timestamp", "date", "open", "high", "low", "close", "volume"]]
+        df = df.convert_dtypes(dtype_backend="pyarrow")
+
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            df.to_parquet(path + ".tmp", compression="zstd", index=False)
+            os.replace(path + ".tmp", path)
+        except OSError:
+            pass  # the disk copy is only an optimisation
+        return df
 
     except Exception as e:
         st.warning(f"⚠️ Failed to fetch Kraken OHLC data: {e}")
         return pd.DataFrame()
 
-# Fetch and validate
+def _last_candle_key(df: pd.DataFrame):
+    """Cheap hash for OHLC-derived frames: shape + last timestamp/close (the partial candle moves)."""
+    if df.empty:
+        return df.shape
+    return df.shape, df["timestamp"].iloc[-1].value, float(df["close"].iloc[-1])
+
+# Fetch and validate (the Ticker request runs alongside the OHLC one; Step 4 picks it up)
+_ticker_future = submit(_pool(), get_kraken_ticker)
 df_ohlc = get_kraken_ohlc(90)
 
 if df_ohlc.empty:
@@ -201,33 +207,119 @@ if df_ohlc.empty:
 # %%
 # --- Step 2: Build unified frame (Kraken has volume; market cap not provided) ---
 
-# Kraken does not provide market_cap. Create a placeholder so downstream code keeps working.
-df_full = df_ohlc.copy()
-df_full["market_cap"] = np.nan  # placeholder; we’ll decide later whether to drop or compute proxy
+# Kraken does not provide market_cap and nothing downstream reads one, so no placeholder
+# column (and no per-rerun copy) is needed: the cached OHLC frame is used as is.
+df_full = df_ohlc
 
-# Now df_full columns: timestamp, open, high, low, close, volume, market_cap (NaN)
+# Now df_full columns: timestamp, date, open, high, low, close, volume
 
 
 # %%
 # --- Step 3: Historical Trends (Kraken daily candles) ---
 # Purpose:
-#   (A) 4-line chart for open/high/low/close with tighter y-range + last-3 markers
+#   (A) 4-line chart for open/high/low/close with tighter y-range + latest-close marker
 #   (B) Split high–low range bars (low→close, close→high) with a close marker
 #   Uses a slider to "zoom" by limiting the visible window (ordinal x doesn't scale-zoom well)
 
-import altair as alt
-import pandas as pd
-import numpy as np
-import streamlit as st
+# Charts are plain Vega-Lite dicts handed to st.vega_lite_chart: building them skips Altair's
+# schema validation + to_dict() on every rerun. Data is passed separately from the spec.
+ZOOM_PARAM = {"name": "zoom", "select": "interval", "bind": "scales"}  # == Altair .interactive()
+
+def ohlc_line_spec(y_min: float, y_max: float) -> dict:
+    """(A) one line layer per open/high/low/close column of the wide frame + marker/label on the `last` row."""
+    date_tip = {"field": "date", "type": "temporal", "title": "Date"}
+    y_scale = {"domain": [y_min, y_max]}
+    lines = [
+        {
+            "mark": {"type": "line", "strokeWidth": 2},
+            "encoding": {
+                "y": {"field": c, "type": "quantitative", "title": "Price (USD)", "scale": y_scale},
+                "color": {"datum": c, "type": "nominal", "title": "Series"},
+                "tooltip": [date_tip, {"field": c, "type": "quantitative", "title": c, "format": ",.2f"}],
+            },
+        }
+        for c in ("open", "high", "low", "close")
+    ]
+    lines[0]["params"] = [ZOOM_PARAM]
+    close = {"field": "close", "type": "quantitative", "title": "Price (USD)"}
+    return {
+        "height": 420,
+        "title": "Bitcoin OHLC — Last N Days (Kraken daily)",
+        "config": {"axis": {"grid": True}},
+        "encoding": {"x": {"field": "date", "type": "temporal", "title": "Date (UTC)"}},
+        "layer": [
+            *lines,
+            {
+                "transform": [{"filter": "datum.last"}],
+                "mark": {"type": "point", "size": 80, "filled": True},
+                "encoding": {
+                    "y": close,
+                    "tooltip": [date_tip, {**close, "title": "Close", "format": ",.2f"}],
+                },
+            },
+            {
+                "transform": [{"filter": "datum.last"}],
+                "mark": {"type": "text", "align": "left", "dx": 6, "dy": -6},
+                "encoding": {"y": close, "text": {"field": "close", "type": "quantitative", "format": ",.0f"}},
+            },
+        ],
+    }
+
+def range_bar_spec(y_min: float, y_max: float) -> dict:
+    """(B) low→close and close→high bars on an ordinal date axis with a close marker."""
+    # Ordinal day buckets formatted by Vega, so no per-row date strings are built in Python
+    day = {"field": "timestamp", "type": "ordinal", "timeUnit": "utcyearmonthdate"}
+    x = {**day, "title": "Date (UTC)", "axis": {"format": "%Y-%m-%d"}}
+    close = {"field": "close", "type": "quantitative"}
+    return {
+        "height": 420,
+        "title": "High–Low Range with Close Marker (Kraken daily)",
+        "config": {"axis": {"grid": True}},
+        "encoding": {"x": x},
+        "layer": [
+            {
+                "mark": {"type": "bar", "size": 8, "opacity": 0.85, "color": "#4C78A8"},
+                "encoding": {
+                    "y": {"field": "low", "type": "quantitative", "title": "Low ↔ High",
+                          "scale": {"domain": [y_min, y_max]}},
+                    "y2": {"field": "close"},
+                    "tooltip": [
+                        {**day, "title": "Date", "format": "%Y-%m-%d"},
+                        {"field": "low", "type": "quantitative", "title": "Low", "format": ",.2f"},
+                        {"field": "close", "type": "quantitative", "title": "Close", "format": ",.2f"},
+                        {"field": "high", "type": "quantitative", "title": "High", "format": ",.2f"},
+                    ],
+                },
+            },
+            {
+                "mark": {"type": "bar", "size": 8, "opacity": 0.85, "color": "#F58518"},
+                "encoding": {"y": close, "y2": {"field": "high"}},
+            },
+            {
+                "mark": {"type": "point", "size": 55, "filled": True},
+                "encoding": {"y": close},
+            },
+        ],
+    }
+
+@st.cache_data(hash_funcs={pd.DataFrame: _last_candle_key}, show_spinner=False)
+def window_frames(df_plot: pd.DataFrame, window_days: int):
+    """Visible window (most recent N days) + the narrow frame for chart (A); cached per candle/window."""
+    df_win = df_plot.tail(window_days).reset_index(drop=True)
+
+    # Wide date/OHLC columns (each line layer reads its own field, no melt/fold), with the
+    # latest row flagged for the marker/label layers (one labelled point; the lines show the rest)
+    df_line = df_win[["date", "open", "high", "low", "close"]].assign(
+        last=np.arange(len(df_win)) == len(df_win) - 1
+    )
+    return df_win, df_line
 
 # Guard: ensure merged Kraken OHLC is available (built earlier as df_full)
 if 'df_full' in locals() and isinstance(df_full, pd.DataFrame) and not df_full.empty:
 
-    # Prep a plotting frame
-    df_plot = df_full.copy()
-    # Add both a temporal date (for continuous x) and a string date (for ordinal x)
-    df_plot["date"] = df_plot["timestamp"].dt.date
-    df_plot["date_str"] = df_plot["timestamp"].dt.strftime("%Y-%m-%d")
+    # Plotting frame: `date` (continuous x) already comes with the cached OHLC, so no copy is needed;
+    # the ordinal range chart buckets `timestamp` itself
+    df_plot = df_full
 
     st.markdown('<div class="section-header"><h2>Historical Trends</h2></div>', unsafe_allow_html=True)
 
@@ -245,102 +337,23 @@ if 'df_full' in locals() and isinstance(df_full, pd.DataFrame) and not df_full.e
         help="Adjust to zoom/pan both charts."
     )
 
-    # Slice to the requested window (most recent N days)
-    df_win = df_plot.tail(window_days).reset_index(drop=True)
+    # Slice to the requested window (+ narrow frame for the line chart)
+    df_win, df_line = window_frames(df_plot, window_days)
 
     # =====================  (A) LINE CHART  =====================
-    # Tighter y-range based on what's visible
-    y_min = float(df_win[["open", "high", "low", "close"]].min().min()) * 0.985
-    y_max = float(df_win[["open", "high", "low", "close"]].max().max()) * 1.015
-
-    base_line = (
-        alt.Chart(df_win)
-        .encode(x=alt.X("date:T", title="Date (UTC)"))
-        .properties(height=420)
-    )
-
-    line_chart = (
-        base_line
-        .transform_fold(
-            ["open", "high", "low", "close"],
-            as_=["variable", "value"]
-        )
-        .mark_line(strokeWidth=2)
-        .encode(
-            y=alt.Y("value:Q", title="Price (USD)",
-                    scale=alt.Scale(domain=[y_min, y_max])),
-            color=alt.Color("variable:N", title="Series"),
-            tooltip=[
-                alt.Tooltip("date:T", title="Date"),
-                alt.Tooltip("variable:N", title="Series"),
-                alt.Tooltip("value:Q", title="Price", format=",.2f"),
-            ],
-        )
-        .properties(title="Bitcoin OHLC — Last N Days (Kraken daily)")
-    )
+    # Tighter y-range based on what's visible; one reduction over the OHLC block serves both
+    # charts (low/high bound open/close, so it equals the range chart's low→high extent)
+    ohlc_vals = df_win[["open", "high", "low", "close"]].to_numpy(dtype=float)
+    y_min = float(np.nanmin(ohlc_vals)) * 0.985
+    y_max = float(np.nanmax(ohlc_vals)) * 1.015
 
-    # Mark the last 3 closes in the visible window
-    last3 = df_win.tail(3)
-    markers = (
-        alt.Chart(last3)
-        .mark_point(size=80, filled=True)
-        .encode(
-            x="date:T",
-            y="close:Q",
-            tooltip=[
-                alt.Tooltip("date:T", title="Date"),
-                alt.Tooltip("close:Q", title="Close", format=",.2f"),
-            ],
-        )
-    )
-    labels = (
-        alt.Chart(last3)
-        .mark_text(align="left", dx=6, dy=-6)
-        .encode(x="date:T", y="close:Q", text=alt.Text("close:Q", format=",.0f"))
-    )
-
-    st.altair_chart(
-        (line_chart + markers + labels).configure_axis(grid=True).interactive(),
-        use_container_width=True
-    )
+    st.vega_lite_chart(df_line, ohlc_line_spec(y_min, y_max), use_container_width=True)
 
     # =====================  (B) RANGE BAR CHART  =====================
     # Ordinal x -> no true drag-zoom; use the same window slider for a clean zoom experience
-    y_min2 = float(df_win["low"].min()) * 0.985
-    y_max2 = float(df_win["high"].max()) * 1.015
-
-    low_to_close = (
-        alt.Chart(df_win)
-        .mark_bar(size=8, opacity=0.85, color="#4C78A8")
-        .encode(
-            x=alt.X("date_str:O", title="Date (UTC)"),
-            y=alt.Y("low:Q", title="Low ↔ High",
-                    scale=alt.Scale(domain=[y_min2, y_max2])),
-            y2="close:Q",
-            tooltip=[
-                alt.Tooltip("date_str:O", title="Date"),
-                alt.Tooltip("low:Q", title="Low",   format=",.2f"),
-                alt.Tooltip("close:Q", title="Close", format=",.2f"),
-                alt.Tooltip("high:Q", title="High",  format=",.2f"),
-            ],
-        )
-        .properties(height=420, title="High–Low Range with Close Marker (Kraken daily)")
-    )
-
-    close_to_high = (
-        alt.Chart(df_win)
-        .mark_bar(size=8, opacity=0.85, color="#F58518")
-        .encode(x="date_str:O", y="close:Q", y2="high:Q")
-    )
-
-    close_points = (
-        alt.Chart(df_win)
-        .mark_point(size=55, filled=True)
-        .encode(x="date_str:O", y="close:Q")
-    )
-
-    st.altair_chart(
-        (low_to_close + close_to_high + close_points).configure_axis(grid=True),
+    st.vega_lite_chart(
+        df_win[["timestamp", "low", "close", "high"]],  # numeric/timestamp columns only -> compact Arrow payload
+        range_bar_spec(y_min, y_max),
         use_container_width=True
     )
 
@@ -348,7 +361,7 @@ else:
     st.warning("⚠️ Historical data not available for plotting (Kraken OHLC frame is empty).")
 
 
-st.markdown("---")
+st.divider()
 
 # %%
 # --- Step 4: Key Market Metrics (Kraken) ---
@@ -357,39 +370,11 @@ st.markdown("---")
 #   B) Last 10 days daily panel (open/high/low/close/volume/return_%) with a pretty table
 #      + two mini charts (Close line, Volume bar). All values in UTC.
 
-import math
-import pandas as pd
-import altair as alt
-import streamlit as st
-from datetime import datetime, timezone
-import requests
-
 # ---------- A) 24h metrics (Kraken Ticker) ----------
 
-@st.cache_data(ttl=120)  # refresh often; ticker is live
-def get_kraken_ticker(pair: str = "XXBTZUSD"):
-    """
-    Kraken Ticker returns last price and 24h stats.
-    Fields: 'c' (last), 'v' (vol today, vol 24h), 'p' (vwap today, vwap 24h),
-            'h' (high today, high 24h), 'l' (low today, low 24h), 'o' (today open).
-    """
-    r = requests.get("https://api.kraken.com/0/public/Ticker", params={"pair": pair}, timeout=15)
-    r.raise_for_status()
-    payload = r.json()
-    if payload.get("error"):
-        raise RuntimeError(", ".join(payload["error"]))
-    key = next(iter(payload["result"].keys()))
-    t = payload["result"][key]
-    return {
-        "last": float(t["c"][0]),      # last traded price (USD)
-        "vol_24h": float(t["v"][1]),   # volume over the last 24h (BTC)
-        "vwap_24h": float(t["p"][1]),  # volume-weighted avg price over the last 24h (USD)
-        "open_today": float(t["o"]),   # today's opening price (USD)
-        "ts_utc": datetime.now(timezone.utc),
-    }
-
-# Small helper other steps can reuse
+# Small helper other steps can reuse (Step 6 panels read spot from the same cached Ticker call)
 def get_spot_price_usd():
+    """Current BTC/USD last trade from the cached Kraken Ticker; NaN if unavailable."""
     try:
         return float(get_kraken_ticker()["last"])
     except Exception:
@@ -397,7 +382,7 @@ def get_spot_price_usd():
 
 # ----- Render A) KPIs -----
 try:
-    m24 = get_kraken_ticker()
+    m24 = _ticker_future.result()
     # Approximate 24h change using last vs 24h VWAP (Kraken doesn’t expose “price 24h ago” directly)
     pct_24h = ((m24["last"] - m24["vwap_24h"]) / m24["vwap_24h"]) * 100.0 if m24["vwap_24h"] else float("nan")
 
@@ -418,16 +403,15 @@ except Exception as e:
 
 # ---------- B) Last 10 days (built from Kraken OHLC set in Step 2) ----------
 
-@st.cache_data(ttl=3600)
+@st.cache_data(ttl=3600, hash_funcs={pd.DataFrame: _last_candle_key})
 def build_daily_last10_from_ohlc(df_ohlc: pd.DataFrame) -> pd.DataFrame:
     """
     From Kraken daily OHLC (df_full), keep last 10 rows and compute day-over-day return %.
-    Expects columns: timestamp, open, high, low, close, volume
+    Expects columns: date, open, high, low, close, volume
     """
     if df_ohlc is None or df_ohlc.empty:
         return pd.DataFrame()
-    df10 = df_ohlc.tail(10).copy().reset_index(drop=True)
-    df10["date"] = df10["timestamp"].dt.date
+    df10 = df_ohlc.tail(10).reset_index(drop=True)
     df10["return_%"] = df10["close"].pct_change() * 100.0
     return df10[["date", "open", "high", "low", "close", "volume", "return_%"]]
 
@@ -444,53 +428,57 @@ try:
         mc1.metric("10-Day Avg Volume (BTC)", f"{avg_vol_10d:,.2f}")
         mc2.metric("10-Day Volatility (σ of returns)", f"{vol_10d:.2f}%")
 
-        # ---- Pretty table view (commas + 2 decimals). Keep numeric df10 for charts. ----
-        df10_fmt = pd.DataFrame({
-            "date": df10["date"],
-            "open":   df10["open"].map(lambda x: f"{x:,.2f}"),
-            "high":   df10["high"].map(lambda x: f"{x:,.2f}"),
-            "low":    df10["low"].map(lambda x: f"{x:,.2f}"),
-            "close":  df10["close"].map(lambda x: f"{x:,.2f}"),
-            "volume (BTC)": df10["volume"].map(lambda x: f"{x:,.2f}"),
-            "return_%": df10["return_%"].map(lambda x: "" if pd.isna(x) else f"{x:.2f}"),
-        })
-        st.dataframe(df10_fmt, hide_index=True, use_container_width=True)
+        # ---- Pretty table view (commas + 2 decimals) ----
+        # Values stay numeric; the Styler only sets how they're displayed (no string columns built per cell)
+        df10_tbl = df10.rename(columns={"volume": "volume (BTC)"}).style.format(
+            {
+                "open": "{:,.2f}",
+                "high": "{:,.2f}",
+                "low": "{:,.2f}",
+                "close": "{:,.2f}",
+                "volume (BTC)": "{:,.2f}",
+                "return_%": "{:.2f}",
+            },
+            na_rep="",
+        )
+        st.dataframe(df10_tbl, hide_index=True, use_container_width=True)
 
         # ---- Mini charts (use numeric df10) ----
         left, right = st.columns(2)
 
-        close_chart = (
-            alt.Chart(df10)
-            .mark_line(point=True)
-            .encode(
-                x=alt.X("date:T", title="Date (UTC)"),
-                y=alt.Y("close:Q", title="Close (USD)"),
-                tooltip=[
-                    alt.Tooltip("date:T", title="Date"),
-                    alt.Tooltip("close:Q", title="Close", format=",.2f"),
-                    alt.Tooltip("return_%:Q", title="Return %", format=".2f"),
+        date_x = {"field": "date", "type": "temporal", "title": "Date (UTC)"}
+        date_tip = {"field": "date", "type": "temporal", "title": "Date"}
+
+        close_spec = {
+            "height": 260,
+            "mark": {"type": "line", "point": True},
+            "params": [ZOOM_PARAM],
+            "encoding": {
+                "x": date_x,
+                "y": {"field": "close", "type": "quantitative", "title": "Close (USD)"},
+                "tooltip": [
+                    date_tip,
+                    {"field": "close", "type": "quantitative", "title": "Close", "format": ",.2f"},
+                    {"field": "return_%", "type": "quantitative", "title": "Return %", "format": ".2f"},
                 ],
-            )
-            .properties(height=260)
-            .interactive()
-        )
-        left.altair_chart(close_chart, use_container_width=True)
-
-        vol_chart = (
-            alt.Chart(df10)
-            .mark_bar()
-            .encode(
-                x=alt.X("date:T", title="Date (UTC)"),
-                y=alt.Y("volume:Q", title="Volume (BTC)"),
-                tooltip=[
-                    alt.Tooltip("date:T", title="Date"),
-                    alt.Tooltip("volume:Q", title="Volume (BTC)", format=",.2f"),
+            },
+        }
+        left.vega_lite_chart(df10, close_spec, use_container_width=True)
+
+        vol_spec = {
+            "height": 260,
+            "mark": "bar",
+            "params": [ZOOM_PARAM],
+            "encoding": {
+                "x": date_x,
+                "y": {"field": "volume", "type": "quantitative", "title": "Volume (BTC)"},
+                "tooltip": [
+                    date_tip,
+                    {"field": "volume", "type": "quantitative", "title": "Volume (BTC)", "format": ",.2f"},
                 ],
-            )
-            .properties(height=260)
-            .interactive()
-        )
-        right.altair_chart(vol_chart, use_container_width=True)
+            },
+        }
+        right.vega_lite_chart(df10, vol_spec, use_container_width=True)
 
     else:
         st.warning("⚠️ No 10-day data available from Kraken.")
@@ -557,15 +545,10 @@ st.info("This section will display the Next-Day High Price prediction using Elas
 # %%
 # --- Step 5: ML Prediction input modes (Yesterday / Today / Manual) WITH pretty previews ---
 # Purpose:
-#   • Three editable input modes, each producing the 7 raw features the FastAPI expects.
-#   • Each numeric input shows a small, formatted preview with thousands separators.
+#   • Three input modes (radio; only the selected one is built), each producing the 7 raw features the FastAPI expects.
+#   • Each mode is one editable row (st.data_editor) formatted with 2 decimals.
 #   • Values are saved in st.session_state as: inputs_yday / inputs_today / inputs_manual
 
-import numpy as np
-import pandas as pd
-import streamlit as st
-from datetime import datetime, timezone
-
 st.subheader("Next-Day HIGH Prediction — Input Modes")
 st.caption(
     "Choose an input mode. All timestamps and data are **UTC**. "
@@ -577,170 +560,102 @@ st.caption(
 
 # ---------- helpers ----------
 
-def safe_get(series, idx, default=np.nan) -> float:
-    """Return series.iloc[idx] if possible, else default (as float)."""
-    try:
-        return float(series.iloc[idx])
-    except Exception:
-        return float(default)
+_THIS_YEAR = datetime.now(timezone.utc).year  # timeHigh_year preset; read once per run
 
-def build_inputs_from_indices(df_daily: pd.DataFrame, idx_today: int):
+def build_input_frame(df_daily: pd.DataFrame) -> pd.DataFrame:
     """
-    Build the 7 RAW inputs using the daily OHLC frame `df_daily`.
-    - close/volume from `df_daily`
-    - body = close - open (same row)
-    - lags from prior rows
+    The 7 RAW inputs for every row of the daily OHLC frame `df_daily`, in one vectorized pass:
+    - close/volume from the same row, body = close - open
+    - lags via shift (NaN before the first rows, never wrapped to the tail)
     - timeHigh_year = current UTC year
     """
-    close_t   = safe_get(df_daily["close"],  idx_today)
-    volume_t  = safe_get(df_daily["volume"], idx_today)
-    open_t    = safe_get(df_daily["open"],   idx_today)
-
-    close_lag1 = safe_get(df_daily["close"], idx_today - 1)
-    close_lag3 = safe_get(df_daily["close"], idx_today - 3)
-    close_lag7 = safe_get(df_daily["close"], idx_today - 7)
-
-    body = float(close_t - open_t) if np.isfinite(open_t) and np.isfinite(close_t) else np.nan
-    year = datetime.now(timezone.utc).year
-
-    return {
-        "close_lag1": close_lag1,
-        "close_lag3": close_lag3,
-        "close_lag7": close_lag7,
-        "body": body,
-        "timeHigh_year": int(year),
-        "close": close_t,
-        "volume": volume_t,
-        "_open_t": open_t,  # exposed for UI reference
-    }
-
-def fmt_money(x: float) -> str:
-    """Format with thousands separator and 2 decimals."""
-    try:
-        return f"{float(x):,.2f}"
-    except Exception:
-        return "—"
+    base = df_daily[["open", "close", "volume"]].astype("float64")  # Arrow nulls -> NaN
+    return pd.DataFrame({
+        "close_lag1": base["close"].shift(1),
+        "close_lag3": base["close"].shift(3),
+        "close_lag7": base["close"].shift(7),
+        "body": base["close"] - base["open"],
+        "close": base["close"],
+        "volume": base["volume"],
+        "_open_t": base["open"],  # exposed for UI reference
+    })
+
+@st.cache_data(hash_funcs={pd.DataFrame: _last_candle_key}, show_spinner=False)
+def compute_presets(df_daily: pd.DataFrame, year: int):
+    """
+    Yesterday / Today / Manual presets; the last row of `df_daily` is 'today (partial)'.
+    `year` (timeHigh_year) is an argument so it is part of the cache key.
+    """
+    inputs = build_input_frame(df_daily).tail(2)
+    rows = [{**r, "timeHigh_year": year} for r in inputs.to_dict("records")]
+    if len(rows) < 2:  # single candle: no 'yesterday'
+        rows.insert(0, {**dict.fromkeys(inputs.columns, np.nan), "timeHigh_year": year})
+    preset_yday, preset_today = rows
+    preset_man = preset_today.copy()  # Manual starts from today’s values
+    return preset_yday, preset_today, preset_man
+
+# Input modes: radio value -> label (the matching Step 6 panel reads st.session_state["inputs_<mode>"])
+INPUT_MODES = {
+    "yday": "📅 Yesterday → Predict Today (complete)",
+    "today": "🟡 Today (partial) → Predict Tomorrow (estimate)",
+    "manual": "✍️ Manual (What-If)",
+}
 
-def preview(value, prefix="↳ "):
-    """Small, subdued one-line preview under an input (commas, 2 decimals)."""
-    st.caption(f"{prefix}{fmt_money(value)}")
+# Order of the 7 raw features the FastAPI expects (also the editor's column order)
+FEATURES = ["close_lag1", "close_lag3", "close_lag7", "body", "timeHigh_year", "close", "volume"]
 
-def num_input_with_preview(label: str, key: str, value: float, step: float = 0.01):
+def input_editor(preset: dict, key: str) -> dict:
     """
-    Render a Streamlit number_input (raw numeric, no commas) and a pretty preview below it.
-    Returns the numeric value.
+    Render the 7 features as one editable row (a single data_editor widget instead of
+    a number_input + caption per field) inside a form, so cell edits don't rerun the
+    page until "Update inputs" is pressed. Returns the edited values as a payload dict.
     """
-    v = st.number_input(label, key=key, value=float(value), step=step, format="%.2f")
-    preview(v)
-    return v
+    column_config = {
+        c: st.column_config.NumberColumn(
+            c, required=True,
+            format="%d" if c == "timeHigh_year" else "%.2f",
+            step=1 if c == "timeHigh_year" else 0.01,
+            min_value=None if c == "body" else 0,  # body = close - open can be negative
+        )
+        for c in FEATURES
+    }
+    with st.form(f"form_{key}", border=False):
+        edited = st.data_editor(
+            pd.DataFrame([{c: preset[c] for c in FEATURES}]),
+            num_rows="fixed", hide_index=True, use_container_width=True,
+            column_config=column_config, key=key,
+        )
+        st.form_submit_button("Update inputs")
+    row = edited.iloc[0]
+    # A cleared cell (None/NaN) falls back to the preset instead of crashing the cast below
+    values = {c: float(preset[c] if pd.isna(row[c]) else row[c]) for c in FEATURES}
+    values["timeHigh_year"] = int(values["timeHigh_year"])
+    return values
 
 # ---------- guards & presets ----------
 
 if ('df_full' not in locals()) or df_full.empty:
     st.warning("⚠️ Not enough data to pre-fill inputs. Make sure Kraken daily OHLC (`df_full`) loaded.")
 else:
-    # df_full is daily OHLC; last row is 'today (partial)'
-    idx_today  = len(df_full) - 1
-    idx_yday   = len(df_full) - 2
-
-    # Build presets
-    preset_today = build_inputs_from_indices(df_full, idx_today)
-    preset_yday  = build_inputs_from_indices(df_full, idx_yday)
-    preset_man   = preset_today.copy()  # Manual starts from today’s values
-
-    # ---------- tabs ----------
-    t1, t2, t3 = st.tabs([
-        "📅 Yesterday → Predict Today (complete)",
-        "🟡 Today (partial) → Predict Tomorrow (estimate)",
-        "✍️ Manual (What-If)"
-    ])
-
-    # ===== Tab 1: Yesterday (complete) =====
-    with t1:
-        st.caption("Uses **yesterday’s** completed daily candle for a clean, reproducible prediction.")
-        c1, c2, c3 = st.columns(3)
-
-        with c1:
-            close_lag1_t1 = num_input_with_preview("close_lag1", "t1_l1", preset_yday["close_lag1"])
-            close_lag3_t1 = num_input_with_preview("close_lag3", "t1_l3", preset_yday["close_lag3"])
-            close_lag7_t1 = num_input_with_preview("close_lag7", "t1_l7", preset_yday["close_lag7"])
-        with c2:
-            open_t1  = num_input_with_preview("open (for body)", "t1_open", preset_yday["_open_t"])
-            close_t1 = num_input_with_preview("close", "t1_close", preset_yday["close"])
-            body_t1  = num_input_with_preview("body = close - open", "t1_body", preset_yday["body"])
-        with c3:
-            volume_t1 = num_input_with_preview("volume", "t1_vol", preset_yday["volume"])
-            year_t1   = st.number_input("timeHigh_year", key="t1_year",
-                                        value=int(preset_yday["timeHigh_year"]), step=1, format="%d")
-            st.caption(f"↳ {year_t1:,}")
-
-        st.session_state["inputs_yday"] = {
-            "close_lag1": close_lag1_t1,
-            "close_lag3": close_lag3_t1,
-            "close_lag7": close_lag7_t1,
-            "body": body_t1,
-            "timeHigh_year": int(year_t1),
-            "close": close_t1,
-            "volume": volume_t1,
-        }
+    # Build presets (cached; only rebuilt when a refetch changes the last candle)
+    preset_yday, preset_today, preset_man = compute_presets(df_full, _THIS_YEAR)
 
-    # ===== Tab 2: Today (partial) =====
-    with t2:
-        st.caption("Uses **today’s partial** intraday candle. Values may change before day close.")
-        c1, c2, c3 = st.columns(3)
-
-        with c1:
-            close_lag1_t2 = num_input_with_preview("close_lag1", "t2_l1", preset_today["close_lag1"])
-            close_lag3_t2 = num_input_with_preview("close_lag3", "t2_l3", preset_today["close_lag3"])
-            close_lag7_t2 = num_input_with_preview("close_lag7", "t2_l7", preset_today["close_lag7"])
-        with c2:
-            open_t2  = num_input_with_preview("open (for body)", "t2_open", preset_today["_open_t"])
-            close_t2 = num_input_with_preview("close", "t2_close", preset_today["close"])
-            body_t2  = num_input_with_preview("body = close - open", "t2_body", preset_today["body"])
-        with c3:
-            volume_t2 = num_input_with_preview("volume", "t2_vol", preset_today["volume"])
-            year_t2   = st.number_input("timeHigh_year", key="t2_year",
-                                        value=int(preset_today["timeHigh_year"]), step=1, format="%d")
-            st.caption(f"↳ {year_t2:,}")
-
-        st.session_state["inputs_today"] = {
-            "close_lag1": close_lag1_t2,
-            "close_lag3": close_lag3_t2,
-            "close_lag7": close_lag7_t2,
-            "body": body_t2,
-            "timeHigh_year": int(year_t2),
-            "close": close_t2,
-            "volume": volume_t2,
-        }
+    # ---------- mode picker ----------
+    # Only the selected mode's editor is built (st.tabs would build all three every rerun)
+    mode = st.radio("Input mode", list(INPUT_MODES), format_func=INPUT_MODES.get,
+                    horizontal=True, key="input_mode")
 
-    # ===== Tab 3: Manual (What-If) =====
-    with t3:
+    if mode == "yday":
+        st.caption("Uses **yesterday’s** completed daily candle for a clean, reproducible prediction.")
+        st.caption(f"Candle open (for body): {preset_yday['_open_t']:,.2f}")
+        st.session_state["inputs_yday"] = input_editor(preset_yday, "editor_yday")
+    elif mode == "today":
+        st.caption("Uses **today’s partial** intraday candle. Values may change before day close.")
+        st.caption(f"Candle open (for body): {preset_today['_open_t']:,.2f}")
+        st.session_state["inputs_today"] = input_editor(preset_today, "editor_today")
+    else:
         st.caption("Starts pre-filled with **Today (partial)** values. Edit freely to test hypothetical scenarios.")
-        c1, c2, c3 = st.columns(3)
-
-        with c1:
-            close_lag1_m = num_input_with_preview("close_lag1", "m_l1", preset_man["close_lag1"])
-            close_lag3_m = num_input_with_preview("close_lag3", "m_l3", preset_man["close_lag3"])
-            close_lag7_m = num_input_with_preview("close_lag7", "m_l7", preset_man["close_lag7"])
-        with c2:
-            open_m  = num_input_with_preview("open (for body)", "m_open", preset_man["_open_t"])
-            close_m = num_input_with_preview("close", "m_close", preset_man["close"])
-            body_m  = num_input_with_preview("body = close - open", "m_body", preset_man["body"])
-        with c3:
-            volume_m = num_input_with_preview("volume", "m_vol", preset_man["volume"])
-            year_m   = st.number_input("timeHigh_year", key="m_year",
-                                       value=int(preset_man["timeHigh_year"]), step=1, format="%d")
-            st.caption(f"↳ {year_m:,}")
-
-        st.session_state["inputs_manual"] = {
-            "close_lag1": close_lag1_m,
-            "close_lag3": close_lag3_m,
-            "close_lag7": close_lag7_m,
-            "body": body_m,
-            "timeHigh_year": int(year_m),
-            "close": close_m,
-            "volume": volume_m,
-        }
+        st.session_state["inputs_manual"] = input_editor(preset_man, "editor_manual")
 
     st.info("Inputs are prepared. Next: run predictions (buttons) using these values.")
 
@@ -751,8 +666,8 @@ else:
 #
 #  Purpose
 #   • Resolve FastAPI predict URL (accept base or full /predict/bitcoin)
-#   • Helpers: API call with retry + current BTC spot fetch
-#   • Three panels (Yesterday / Today / Manual) – each keeps its last result visible
+#   • Helpers: API call over the shared retrying session (spot price comes from Step 4's cached Kraken Ticker)
+#   • Panel for the selected mode (Yesterday / Today / Manual) – each keeps its last result visible
 #   • Fix “double render on click” by returning early after drawing fresh results
 #   • Append every run to a Prediction History section
 
@@ -764,70 +679,57 @@ if api_input:
     predict_url = api_input if "/predict/" in api_input else f"{api_input}/predict/bitcoin"
 
 # ------------------------------- 2) Helpers -----------------------------------
-def call_predict(url: str, payload: dict, retries: int = 1, timeout: int = 20):
+def call_predict(url: str, payload: dict, timeout: int = 20):
     """
-    Call GET {url} with params=payload. Retry once for transient 5xx/cold starts.
-    Returns (ok: bool, data_or_error: dict|str)
+    Call GET {url} with params=payload over the shared session (its adapter retries
+    transient 5xx/cold starts). Returns (ok: bool, data_or_error: dict|str)
     """
     try:
-        r = requests.get(url, params=payload, timeout=timeout)
+        r = _http().get(url, params=payload, timeout=timeout)
         if r.status_code == 200:
             return True, r.json()
-        if retries > 0 and r.status_code in (502, 503, 504, 524):
-            time.sleep(2)
-            r = requests.get(url, params=payload, timeout=timeout)
-            if r.status_code == 200:
-                return True, r.json()
         return False, f"HTTP {r.status_code}: {r.text[:500]}"
     except Exception as e:
-        if retries > 0:
-            time.sleep(2)
-            try:
-                r = requests.get(url, params=payload, timeout=timeout)
-                if r.status_code == 200:
-                    return True, r.json()
-                return False, f"HTTP {r.status_code}: {r.text[:500]}"
-            except Exception as e2:
-                return False, f"{type(e2).__name__}: {e2}"
         return False, f"{type(e).__name__}: {e}"
 
-def get_spot_price_usd():
-    """Return current BTC/USD spot (reuse cached 24h dict if available; else quick fetch)."""
-    try:
-        if "m24" in globals() and isinstance(m24, dict) and "price" in m24:
-            return float(m24["price"])
-        r = requests.get(
-            "https://api.coingecko.com/api/v3/simple/price",
-            params={"ids": "bitcoin", "vs_currencies": "usd"},
-            timeout=15,
-        )
-        r.raise_for_status()
-        return float(r.json()["bitcoin"]["usd"])
-    except Exception:
-        return float("nan")
-
-def render_metrics_two_rows(pred_value: float, spot: float):
-    """Two-row layout to avoid truncation: (Pred/Current) then (Δ USD / Δ %)."""
-    # Row 1
-    r1c1, r1c2 = st.columns(2)
-    r1c1.metric("Predicted High (Next Day)", f"${pred_value:,.2f}")
-    r1c2.metric("Current Price (USD)", f"${spot:,.2f}")
-    # Row 2
-    r2c1, r2c2 = st.columns(2)
+@st.cache_data(ttl=300, show_spinner=False)
+def call_predict_cached(url: str, payload_items: tuple):
+    """
+    call_predict memoized on the (sorted) payload items, so re-clicking Predict with the
+    same 7 inputs is a cache hit. Failures raise instead of returning, so they aren't cached.
+    """
+    ok, data = call_predict(url, dict(payload_items))
+    if not ok:
+        raise RuntimeError(data)
+    return data
+
+def _json_block(obj):
+    """Pretty JSON as a code block (orjson encode; lighter than st.json's interactive tree)."""
+    st.code(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY).decode(), language="json")
+
+def _compute_metric_rows(pred_value: float, spot: float):
+    """Formatted (label, value) pairs for the two metric rows + raw (delta, pct)."""
+    row1 = (("Predicted High (Next Day)", f"${pred_value:,.2f}"), ("Current Price (USD)", f"${spot:,.2f}"))
     if spot == spot:  # not NaN
         delta = pred_value - spot
         pct = (delta / spot) * 100.0 if spot else float("nan")
-        r2c1.metric("Δ vs Current (USD)", f"${delta:,.2f}")
-        r2c2.metric("Δ vs Current (%)", f"{pct:.2f}%")
-        return delta, pct
-    else:
-        r2c1.metric("Δ vs Current (USD)", "N/A")
-        r2c2.metric("Δ vs Current (%)", "N/A")
-        return None, None
+        row2 = (("Δ vs Current (USD)", f"${delta:,.2f}"), ("Δ vs Current (%)", f"{pct:.2f}%"))
+        return row1, row2, delta, pct
+    row2 = (("Δ vs Current (USD)", "N/A"), ("Δ vs Current (%)", "N/A"))
+    return row1, row2, None, None
+
+def render_metrics_two_rows(pred_value: float, spot: float):
+    """Two-row layout to avoid truncation: (Pred/Current) then (Δ USD / Δ %)."""
+    row1, row2, delta, pct = _compute_metric_rows(pred_value, spot)
+    for row in (row1, row2):
+        for col, (label, value) in zip(st.columns(2), row):
+            col.metric(label, value)
+    return delta, pct
 
 # -------------------------- 3) Session state init -----------------------------
+PRED_HISTORY_MAX = 20  # bounds session memory and the history table
 if "pred_history" not in st.session_state:
-    st.session_state["pred_history"] = []  # list of dicts in click order
+    st.session_state["pred_history"] = deque(maxlen=PRED_HISTORY_MAX)  # dicts in click order, newest kept
 if "panel_results" not in st.session_state:
     st.session_state["panel_results"] = {}  # {mode_title: last_result_dict}
 
@@ -856,9 +758,10 @@ def panel(mode_title: str, payload_key: str, disclaimer: str | None = None):
         if not predict_url:
             st.error("SERVICE_BTC_PREDICT_URL is not set.")
             return
-        ok, data = call_predict(predict_url, payload)
-        if not ok:
-            st.error(f"Prediction failed: {data}")
+        try:
+            data = call_predict_cached(predict_url, tuple(sorted(payload.items())))
+        except RuntimeError as e:
+            st.error(f"Prediction failed: {e}")
             return
 
         pred = float(data["predicted_high_next_day"])
@@ -875,40 +778,77 @@ def panel(mode_title: str, payload_key: str, disclaimer: str | None = None):
             "pct": pct,
             "payload": payload,
         }
-        st.session_state["panel_results"][mode_title] = result
+        # Banner text for Case B is built once here, not on every rerun
+        info = f"Last result · {result['ts']} · model `{result['model']}`"
+        st.session_state["panel_results"][mode_title] = {**result, "info": info}
         st.session_state["pred_history"].append({**result, "mode": mode_title})
 
-        with st.expander("Show inputs sent to the model"):
-            st.json(payload)
+        # Toggle instead of expander: collapsed expanders still encode and ship their JSON.
+        # Same label + key as in Case B, so Streamlit sees one widget and keeps its state across branches
+        if st.toggle("Show inputs sent to the model", key=f"show_inputs_{payload_key}"):
+            _json_block(payload)
         return  # important: do NOT also render the saved block now
 
     # --- Case B: no click → show last saved result (if any) once ---
     saved = st.session_state["panel_results"].get(mode_title)
     if saved:
-        st.info(f"Last result · {saved['ts']} · model `{saved['model']}`")
+        st.info(saved["info"])
         render_metrics_two_rows(saved["pred"], saved["spot"])
-        with st.expander("Inputs used (last run)"):
-            st.json(saved["payload"])
+        if st.toggle("Show inputs sent to the model", key=f"show_inputs_{payload_key}"):
+            _json_block(saved["payload"])
 
-if not predict_url:
-    st.warning("Set `SERVICE_BTC_PREDICT_URL` in env or `.streamlit/secrets.toml` to enable predictions.")
-else:
-    panel("Yesterday → Predict Today (complete)", "inputs_yday")
-    panel(
-        "Today (partial) → Predict Tomorrow (estimate)",
-        "inputs_today",
-        "Note: using **partial** intraday data; values may change before day close.",
-    )
-    panel("Manual (What-If)", "inputs_manual")
-
-st.markdown("----")
-
-# --------------------------- 5) Prediction History ----------------------------
-if st.session_state["pred_history"]:
-    st.markdown("### Prediction History (this session)")
-    for i, h in enumerate(st.session_state["pred_history"], start=1):
-        st.markdown(f"**#{i} · {h.get('mode','')}** · _{h['ts']}_ · model: `{h['model']}`")
-        render_metrics_two_rows(h["pred"], h["spot"])
-        with st.expander("Inputs used"):
-            st.json(h["payload"])
-        st.markdown("---")
+@st.experimental_fragment
+def prediction_section():
+    """
+    Panel + Prediction History as one fragment: a Predict click (or picking a history run)
+    reruns just this section, charts and input editors are left alone, and the history
+    table below the panel already includes the new run.
+    """
+    if not predict_url:
+        st.warning("Set `SERVICE_BTC_PREDICT_URL` in env or `.streamlit/secrets.toml` to enable predictions.")
+    else:
+        # Only the panel for the mode picked in Step 5 (its inputs are the only ones built this run)
+        mode = st.session_state.get("input_mode", "yday")
+        if mode == "yday":
+            panel("Yesterday → Predict Today (complete)", "inputs_yday")
+        elif mode == "today":
+            panel(
+                "Today (partial) → Predict Tomorrow (estimate)",
+                "inputs_today",
+                "Note: using **partial** intraday data; values may change before day close.",
+            )
+        else:
+            panel("Manual (What-If)", "inputs_manual")
+
+    st.divider()
+
+    # --------------------------- 5) Prediction History ----------------------------
+    history = list(st.session_state["pred_history"])  # one session_state read for the section
+    if history:
+        st.markdown("### Prediction History (this session)")
+        # One table for all runs instead of markdown + metrics + expander per entry
+        hist_df = pd.DataFrame([
+            {
+                "#": i,
+                "mode": h.get("mode", ""),
+                "ts (UTC)": h["ts"],
+                "model": h["model"],
+                "predicted high": h["pred"],
+                "spot": h["spot"],
+                "Δ USD": h["delta"],
+                "Δ %": h["pct"],
+            }
+            for i, h in enumerate(history, start=1)
+        ])
+        hist_tbl = hist_df.style.format(
+            {"predicted high": "${:,.2f}", "spot": "${:,.2f}", "Δ USD": "${:,.2f}", "Δ %": "{:.2f}%"},
+            na_rep="N/A",
+        )
+        st.dataframe(hist_tbl, hide_index=True, use_container_width=True)
+        # Inputs for one run at a time: a single code block, only when a run is picked
+        run = st.selectbox("Show inputs for run", [None, *range(1, len(history) + 1)],
+                           format_func=lambda i: "—" if i is None else f"#{i}", key="history_inputs_run")
+        if run is not None:
+            _json_block(history[run - 1]["payload"])
+
+prediction_section()
@@ -1,91 +1,97 @@
 import streamlit as st
+from ui import asset, inject_css, submit
 import pandas as pd
+import numpy as np
 import requests
-import plotly.graph_objects as go
 import os
 from datetime import datetime
 import time
+import threading
 import datetime
 from datetime import timezone
+from concurrent.futures import ThreadPoolExecutor
 
 BASE_DIR = os.path.dirname(__file__)
 APP_DIR = os.path.dirname(BASE_DIR) 
 st.set_page_config(page_title="Ethereum", page_icon="💎", layout="wide")
 
-st.markdown("""
-<style>
-/* Body & background */
-body {
-    background: linear-gradient(135deg, #1f1c2c, #282843);
-    color: #f0f0f0;
-}
-
-/* Fonts */
-h1, h2, h3 {
-    font-family: 'Poppins', sans-serif;
-}
-p {
-    font-family: 'Roboto', sans-serif;
-    font-size: 1rem;
-    line-height: 1.5rem;
-}
-
-/* Crypto cards */
-.crypto-card {
-    border-radius: 20px;
-    box-shadow: 0 10px 25px rgba(0,0,0,0.4);
-    transition: transform 0.2s;
-    text-align: center;
-    background-color: #2a2a3e;
-    padding: 15px;
-    margin-bottom: 20px;
-}
-.crypto-card:hover {
-    transform: scale(1.05);
-}
-
-/* Images hover effect */
-.crypto-card img {
-    border-radius: 15px;
-    transition: transform 0.3s ease-in-out;
-}
-.crypto-card img:hover {
-    transform: scale(1.05);
-}
-
-/* Buttons */
-.stButton>button {
-    background: linear-gradient(45deg, #ff9900, #ff6600);
-    color: white;
-    font-weight: bold;
-    border-radius: 12px;
-    padding: 8px 16px;
-    transition: all 0.3s ease;
-    width: 100%;
-}
-.stButton>button:hover {
-    transform: translateY(-3px);
-    box-shadow: 0 5px 15px rgba(255, 153, 0, 0.6);
-}
-
-/* Section header */
-.section-header {
-    background-color: #3a3a55;
-    padding: 20px;
-    border-radius: 15px;
-    margin-bottom: 25px;
-    text-align: center;
-}
-.section-header h2 {
-    color: #ff9900;
-    margin: 0;
-}
-.section-header p {
-    color: #ffffff;
-    margin: 5px 0 0 0;
-}
-</style>
-""", unsafe_allow_html=True)
+#Data Fetch - Kraken Endpoint
+
+@st.cache_resource(show_spinner=False)
+def _http():
+    """One pooled keep-alive session per server process, reused by every API call on this page."""
+    s = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=2)
+    s.mount("https://", adapter)
+    s.headers.update({"Accept-Encoding": "gzip"})
+    return s
+
+OHLC_TTL = 3600  # 1 hour
+
+def fetch_kraken_ohlc(pair="ETHUSD", interval=1440):
+    """
+    Fetch OHLC data from Kraken.
+    interval=1440 -> daily candles
+    Returns a DataFrame.
+    """
+    url = "https://api.kraken.com/0/public/OHLC"
+    params = {
+        "pair": pair,
+        "interval": interval,
+    }
+    response = _http().get(url, params=params, timeout=20)
+    response.raise_for_status()
+    data = response.json()
+    
+    ohlc = data['result'][list(data['result'].keys())[0]]  # get the pair key
+
+    # Rows are [ts, open, high, low, close, vwap, volume, count] with the prices as strings;
+    # cast each block once instead of building string columns and converting them one by one
+    arr = np.asarray(ohlc, dtype=object)
+    ts = pd.to_datetime(arr[:, 0].astype(np.int64), unit='s')
+    floats = arr[:, 1:7].astype(np.float64)
+    counts = arr[:, 7].astype(np.int64)
+
+    df = pd.DataFrame(
+        floats,
+        columns=["open", "high", "low", "close", "vwap", "volume"],
+        index=pd.DatetimeIndex(ts, name="timestamp"),
+    )
+    df["count"] = counts
+
+    # Arrow-backed columns: the frame is shared by every session, and slices stay zero-copy
+    return df.convert_dtypes(dtype_backend="pyarrow")
+
+@st.cache_resource(show_spinner=False)
+def _eth_ohlc_store():
+    """
+    One OHLC frame shared by every session (no per-hit pickling like st.cache_data).
+    Treat store["df"] as read-only.
+    """
+    return {"df": fetch_kraken_ohlc(), "t": time.time(), "lock": threading.Lock()}
+
+def get_eth_ohlc():
+    store = _eth_ohlc_store()
+    if time.time() - store["t"] > OHLC_TTL:
+        # Only the first stale session refreshes; the others keep serving the current frame
+        if store["lock"].acquire(blocking=False):
+            try:
+                store.update(df=fetch_kraken_ohlc(), t=time.time())
+            except requests.exceptions.RequestException:
+                pass
+            finally:
+                store["lock"].release()
+    return store["df"]
+
+@st.cache_resource
+def _pool():
+    return ThreadPoolExecutor(max_workers=2)
+
+# Start the Kraken download now so the network wait overlaps with rendering the static sections below
+_ohlc_future = submit(_pool(), get_eth_ohlc)
+
+
+inject_css("dashboard.css", "ethereum.css")
 
 #Title and Info
 st.markdown('<div class="section-header"><h2>Ethereum Dashboard</h2><p>The blockchain that powers smart contracts and decentralized apps</p></div>', unsafe_allow_html=True)
@@ -96,8 +102,7 @@ col1, col2, col3 = st.columns([1, 4, 1])
 with col2:
     img_col1, img_col2, img_col3 = st.columns([1, 2, 1])
     with img_col2:
-        eth = os.path.join(APP_DIR, "assets", "eth.svg")
-        st.image(eth)
+        st.markdown(f'<img src="{asset("eth.svg")}" style="width:100%">', unsafe_allow_html=True)
 
 st.write("""
 **Ethereum (ETH)** is a decentralized platform that introduced smart contracts, 
@@ -160,39 +165,7 @@ with col3:
         unsafe_allow_html=True
     )
 
-#Data Fetch - Kraken Endpoint
-
-@st.cache_data(ttl=3600)
-def fetch_kraken_ohlc(pair="ETHUSD", interval=1440):
-    """
-    Fetch OHLC data from Kraken.
-    interval=1440 -> daily candles
-    Returns a DataFrame.
-    """
-    url = "https://api.kraken.com/0/public/OHLC"
-    params = {
-        "pair": pair,
-        "interval": interval,
-    }
-    response = requests.get(url, params=params)
-    response.raise_for_status()
-    data = response.json()
-    
-    ohlc = data['result'][list(data['result'].keys())[0]]  # get the pair key
-    df = pd.DataFrame(ohlc, columns=[
-        "timestamp", "open", "high", "low", "close", "vwap", "volume", "count"
-    ])
-    df["timestamp"] = pd.to_datetime(df["timestamp"], unit='s')
-    df.set_index("timestamp", inplace=True)
-    
-    # Convert numeric columns to float
-    for col in ["open", "high", "low", "close", "vwap", "volume"]:
-        df[col] = df[col].astype(float)
-    df["count"] = df["count"].astype(int)
-    
-    return df
-
-df = fetch_kraken_ohlc()
+df = _ohlc_future.result()  # started in the background right after page config
 
 # Historic Candle Plots
 st.markdown("---")
@@ -200,41 +173,48 @@ st.markdown("---")
 st.markdown('<div class="section-header"><h2>Trend Candle Chart</h2><p></p></div>', unsafe_allow_html=True)
 
 
-df_hist = df.iloc[:-1].tail(100)
-
-fig = go.Figure(data=[go.Candlestick(
-    x=df_hist.index,
-    open=df_hist['open'],
-    high=df_hist['high'],
-    low=df_hist['low'],
-    close=df_hist['close'],
-    name = 'Eth'
-)])
-fig.update_layout(
-    title="ETH Daily OHLC - Last 100 Days",
-    xaxis_title="Date",
-    yaxis_title="Price (USD)",
-    xaxis_rangeslider_visible=False
-)
-st.plotly_chart(fig, use_container_width=True)
-
-df_hist = df.iloc[:-1].tail(100)
-
-fig = go.Figure(data=[go.Candlestick(
-    x=df.index,
-    open=df['open'],
-    high=df['high'],
-    low=df['low'],
-    close=df['close'],
-    name = 'Eth'
-)])
-fig.update_layout(
-    title="ETH Daily OHLC - Last 2 Years",
-    xaxis_title="Date",
-    yaxis_title="Price (USD)",
-    xaxis_rangeslider_visible=False
-)
-st.plotly_chart(fig, use_container_width=True)
+def _candle(df, title):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(data=[go.Candlestick(
+        x=df.index.to_numpy(),
+        open=df['open'].to_numpy(),
+        high=df['high'].to_numpy(),
+        low=df['low'].to_numpy(),
+        close=df['close'].to_numpy(),
+        name = 'Eth'
+    )])
+    return fig.update_layout(
+        title=title,
+        xaxis_title="Date",
+        yaxis_title="Price (USD)",
+        xaxis_rangeslider_visible=False
+    )
+
+def downsample_ohlc(df, n_out=300):
+    """
+    Merge consecutive candles into ~n_out buckets (first open, max high, min low, last close)
+    so long ranges keep their peaks but ship far fewer points to the browser.
+    """
+    if len(df) <= n_out:
+        return df
+    bucket = np.arange(len(df)) * n_out // len(df)
+    out = df.groupby(bucket).agg(
+        open=("open", "first"),
+        high=("high", "max"),
+        low=("low", "min"),
+        close=("close", "last"),
+    )
+    out.index = pd.DatetimeIndex(df.index.to_series().groupby(bucket).first(), name=df.index.name)
+    return out
+
+def plot_candle(df, title):
+    # Not cached: st.plotly_chart (1.36) re-validates and re-serializes whatever it is given,
+    # so a cached figure or JSON would only add frame hashing on top of that
+    st.plotly_chart(_candle(df, title), use_container_width=True)
+
+plot_candle(df.iloc[:-1].tail(100), "ETH Daily OHLC - Last 100 Days")
+plot_candle(downsample_ohlc(df.iloc[:-1]), "ETH Daily OHLC - Last 2 Years")
 
 
 
@@ -247,75 +227,28 @@ st.markdown('<div class="section-header"><h2>Key Market Metrics (Latest Daily Ca
 
 
 latest = df.iloc[-1]
-previous = df.iloc[-2]
-
-def percent_change(new, old):
-    try:
-        return ((new - old) / old) * 100
-    except ZeroDivisionError:
-        return 0
-
-price_delta = percent_change(latest['close'], previous['close'])
-high_delta = percent_change(latest['high'], previous['high'])
-low_delta = percent_change(latest['low'], previous['low'])
-vwap_delta = percent_change(latest['vwap'], previous['vwap'])
-vol_delta = percent_change(latest['volume'], previous['volume'])
-count_delta = percent_change(latest['count'], previous['count'])
-
-col1, col2 = st.columns(2)
-col1.metric(
-    "Current Price (USD)", 
-    f"{latest['close']:.2f}", 
-    delta=f"{price_delta:.2f}%",
-    delta_color="normal"
-)
-col2.metric(
-    "High (24h)", 
-    f"{latest['high']:.2f}", 
-    delta=f"{high_delta:.2f}%",
-    delta_color="normal"
-)
 
-col3, col4 = st.columns(2)
-col3.metric(
-    "Low (24h)", 
-    f"{latest['low']:.2f}", 
-    delta=f"{low_delta:.2f}%",
-    delta_color="normal"
-)
-col4.metric(
-    "VWAP (24h)", 
-    f"{latest['vwap']:.2f}", 
-    delta=f"{vwap_delta:.2f}%",
-    delta_color="normal"
-)
+# Day-over-day % change for all six metrics in one NumPy op over the last two rows
+# (a zero previous value gives 0 instead of inf/NaN)
+metric_cols = ["close", "high", "low", "vwap", "volume", "count"]
+last2 = df[metric_cols].iloc[-2:].to_numpy(dtype=float)
+with np.errstate(divide="ignore", invalid="ignore"):
+    pct = (last2[1] / last2[0] - 1) * 100
+price_delta, high_delta, low_delta, vwap_delta, vol_delta, count_delta = np.where(np.isfinite(pct), pct, 0.0)
 
-col5, col6 = st.columns(2)
-col5.metric(
-    "Trading Volume Current",
-    f"{latest['volume']:.2f}", 
-    delta=f"{vol_delta:.2f}%",
-    delta_color="normal"
-)
-col6.metric(
-    "Number of Trades Current", 
-    f"{latest['count']}", 
-    delta=f"{count_delta:.2f}%",
-    delta_color="normal"
-)
+metric_rows = [
+    ("Current Price (USD)", f"{latest['close']:.2f}", price_delta),
+    ("High (24h)", f"{latest['high']:.2f}", high_delta),
+    ("Low (24h)", f"{latest['low']:.2f}", low_delta),
+    ("VWAP (24h)", f"{latest['vwap']:.2f}", vwap_delta),
+    ("Trading Volume Current", f"{latest['volume']:.2f}", vol_delta),
+    ("Number of Trades Current", f"{latest['count']}", count_delta),
+]
+
+# One row of six metrics instead of three separate column layouts
+for col, (label, value, delta) in zip(st.columns(6), metric_rows):
+    col.metric(label, value, delta=f"{delta:.2f}%", delta_color="normal")
 
-st.markdown("""
-<style>
-[data-testid="stMetricValue"] {
-    font-size: 1.5rem;
-    color: inherit; /* adapts to theme automatically */
-}
-[data-testid="stMetricDelta"] {
-    font-weight: bold;
-    font-size: 1.1rem;
-}
-</style>
-""", unsafe_allow_html=True)
 
 
 
@@ -331,6 +264,7 @@ st.markdown('<div class="section-header"><h2>High Price Predictions for Tomorrow
 utc_now = datetime.datetime.now(timezone.utc)
 formatted_date = utc_now.strftime("%b %d, %Y")
 formatted_time = utc_now.strftime("%H:%M:%S")
+utc_day = utc_now.strftime("%Y-%m-%d")  # prediction cache key
 
 st.metric(
     label="Current UTC Time",
@@ -345,30 +279,64 @@ url = "https://at3-25106954-api.onrender.com/predict/eth"
 
 import requests, time
 
+ROOT_URL = url.replace("/predict/eth", "/")
+
+# Fire-and-forget pings get their own worker, so other sessions' slow pings never queue ahead of the OHLC prefetch
+@st.cache_resource
+def _warmup_pool():
+    return ThreadPoolExecutor(max_workers=1)
+
+# Ping the API root once per session so a sleeping Render instance wakes while the user reads the page
+if not st.session_state.get("eth_api_pinged"):
+    st.session_state["eth_api_pinged"] = True
+    submit(_warmup_pool(), lambda: _http().get(ROOT_URL, timeout=5))
+
+def wait_until_awake(max_wait=90):
+    """
+    Probe the API root with exponential backoff (2s, 4s, ... capped at 30s) until the app
+    itself answers, so the full /predict/eth call is only made once the server is up.
+    Any status below 500 counts (the service may have no "/" route and return 404);
+    Render's proxy answers 5xx while the instance is still starting.
+    """
+    deadline = time.time() + max_wait
+    delay = 2
+    while time.time() < deadline:
+        try:
+            if _http().get(ROOT_URL, timeout=5).status_code < 500:
+                return True
+        except requests.exceptions.RequestException:
+            pass
+        time.sleep(min(delay, max(0, deadline - time.time())))
+        delay = min(delay * 2, 30)
+    return False
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_eth_prediction(utc_day):
+    """
+    Next-day high prediction, cached per UTC day for 5 minutes so repeat clicks don't
+    re-wake the server. Raises on failure (failures are not cached).
+    """
+    if not wait_until_awake():
+        raise TimeoutError("prediction server did not wake up")
+    response = _http().get(url, timeout=30)
+    response.raise_for_status()
+    return response.json()
+
 if st.button("Predict Tomorrow's High Price"):
     with st.spinner("Waking up prediction server... this may take a few minutes if asleep"):
-        max_retries = 60       
-        wait_seconds = 10      
         data = None
         success = False
-
-        for attempt in range(max_retries):
-            try:
-                response = requests.get(url, timeout=30)
-                if response.status_code == 200:
-                    data = response.json()
-                    success = True
-                    break
-            except requests.exceptions.RequestException:
-                pass
-            time.sleep(wait_seconds)
+        try:
+            data = fetch_eth_prediction(utc_day)
+            success = True
+        except (requests.exceptions.RequestException, ValueError, TimeoutError):
+            pass
 
         if not success:
             st.error("The prediction server is still waking up. Please try again in a few minutes.")
         else:
             predicted_date = data.get("predicted_date", "N/A")
-            date_obj = datetime.datetime.strptime(predicted_date, "%Y-%m-%d")
-            formatted_date = date_obj.strftime("%b %d, %Y")
+            formatted_date = datetime.date.fromisoformat(predicted_date).strftime("%b %d, %Y")
             predicted_high = data.get("predicted_tomorrow_high", None)
 
             if predicted_high is not None:
@@ -376,9 +344,6 @@ if st.button("Predict Tomorrow's High Price"):
                 diff = predicted_high - latest_high
                 perc_change = (diff / latest_high) * 100
 
-                date_obj = datetime.datetime.strptime(predicted_date, "%Y-%m-%d")
-                formatted_date = date_obj.strftime("%b %d, %Y")
-
                 st.markdown("---")
                 col1, col2 = st.columns(2)
                 with col1:
@@ -1,9 +1,10 @@
 # streamlit_app.py
-import os, time, base64, requests
+import os, time, random, requests
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import numpy as np
 import streamlit as st
-import altair as alt
+from ui import asset, inject_css, submit
 
 BASE_DIR = os.path.dirname(__file__)
 APP_DIR = os.path.dirname(BASE_DIR) 
@@ -15,108 +16,15 @@ st.set_page_config(page_title="XRP", page_icon="💠", layout="wide")
 ################################# Light CSS adjustments (theme adaptive) ###############################
 ##------------ Adds lightweight, theme-adaptive CSS for improved layout and clean UI 
 
-st.markdown("""
-<style>
-/* Body & background */
-body {
-    background: linear-gradient(135deg, #1f1c2c, #282843);
-    color: #f0f0f0;
-}
-
-/* Fonts */
-h1, h2, h3 {
-    font-family: 'Poppins', sans-serif;
-}
-p {
-    font-family: 'Roboto', sans-serif;
-    font-size: 1rem;
-    line-height: 1.5rem;
-}
-
-/* Crypto cards */
-.crypto-card {
-    border-radius: 20px;
-    box-shadow: 0 10px 25px rgba(0,0,0,0.4);
-    transition: transform 0.2s;
-    text-align: center;
-    background-color: #2a2a3e;
-    padding: 15px;
-    margin-bottom: 20px;
-}
-.crypto-card:hover {
-    transform: scale(1.05);
-}
-
-/* Images hover effect */
-.crypto-card img {
-    border-radius: 15px;
-    transition: transform 0.3s ease-in-out;
-}
-.crypto-card img:hover {
-    transform: scale(1.05);
-}
-
-/* Buttons */
-.stButton>button {
-    background: linear-gradient(45deg, #ff9900, #ff6600);
-    color: white;
-    font-weight: bold;
-    border-radius: 12px;
-    padding: 8px 16px;
-    transition: all 0.3s ease;
-    width: 100%;
-}
-.stButton>button:hover {
-    transform: translateY(-3px);
-    box-shadow: 0 5px 15px rgba(255, 153, 0, 0.6);
-}
-
-/* Section header */
-.section-header {
-    background-color: #3a3a55;
-    padding: 20px;
-    border-radius: 15px;
-    margin-bottom: 25px;
-    text-align: center;
-}
-.section-header h2 {
-    color: #ff9900;
-    margin: 0;
-}
-.section-header p {
-    color: #ffffff;
-    margin: 5px 0 0 0;
-}
-
-/* Status box (top-right) */
-.status-box {
-  position: absolute; top: 15px; right: 25px;
-  font-size: 14px; color: var(--secondary-text-color, #888);
-}
-
-/* Segmented radio (hide default dots, show pills) */
-div[role="radiogroup"] { gap: 12px !important; }
-div[role="radiogroup"] > label {
-  border: 1px solid rgba(128,128,128,0.35);
-  border-radius: 10px; padding: 8px 18px;
-  cursor: pointer; user-select: none;
-}
-div[role="radiogroup"] > label:hover {
-  background: rgba(127,127,127,0.08);
-}
-div[role="radiogroup"] > label[aria-checked="true"] {
-  background: var(--primary-color); color: #fff; border-color: var(--primary-color);
-}
-div[role="radiogroup"] svg { display: none !important; } /* hide dots */
-</style>
-""", unsafe_allow_html=True)
+inject_css("dashboard.css", "ripple.css")
 
 
 ################################## Config variables #################################
 ##------ API base, image path, session state and cooldown timers
 
 API_BASE = os.getenv("XRP_API_BASE", "https://advml-at3-api-25664525.onrender.com")
-xrp = os.path.join(APP_DIR, "assets", "xrp.jpg")
+#served by Streamlit's static file server (app/static/), so the browser fetches and caches it once
+xrp = asset("xrp.jpg")
 
 
 
@@ -135,25 +43,49 @@ if "window" not in st.session_state:
 ################################### API Helper Functions  ##################################
 #### ---------------- Data fetching, caching and retries
 
+@st.cache_resource(show_spinner=False)
+def _http():
+    """Keep-alive session shared by every API call (and the history worker threads)."""
+    s = requests.Session()
+    s.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=4))
+    return s
+
+@st.cache_resource(show_spinner=False)
+def _pool():
+    return ThreadPoolExecutor(max_workers=4)
+
+API_COOLDOWN = 30  #fail fast for 30s after a call exhausts its retries
+
+#breaker state is per session (history workers get the session via ui.submit), so one user's failure doesn't block everyone
 def get_json(path, params=None, retries=3, timeout=15):
     url = f"{API_BASE.rstrip('/')}/{str(path).lstrip('/')}"
+    if time.time() < st.session_state.get("api_down_until", 0.0):
+        return None, "API unavailable, retrying shortly"
     for i in range(retries):
         try:
-            r = requests.get(url, params=params, timeout=timeout)
+            r = _http().get(url, params=params, timeout=timeout)
             r.raise_for_status()
             return r.json(), None
         except requests.exceptions.RequestException as e:
             if i == retries - 1:
+                st.session_state["api_down_until"] = time.time() + API_COOLDOWN
                 return None, str(e)
-            time.sleep(2 * (i + 1))  #2s, 4s, 6s backoff
+            time.sleep(min(10, 2 ** i + random.random()))  #~1s, ~2s jittered backoff
 
+#cached wrappers raise on failure: st.cache_data doesn't store exceptions, so an error never outlives the call
 @st.cache_data(ttl=30, show_spinner=False)
 def fetch_health():
-    return get_json("health")
+    js, err = get_json("health")
+    if err:
+        raise RuntimeError(err)
+    return js
 
 @st.cache_data(ttl=300, show_spinner=False)
 def fetch_predict_cached():
-    return get_json("predict/XRP")
+    js, err = get_json("predict/XRP")
+    if err:
+        raise RuntimeError(err)
+    return js
 
 def refresh_all_histories():
     """
@@ -161,9 +93,13 @@ def refresh_all_histories():
     st.session_state.hist_cache will be:
         { window: {"df": pandas.DataFrame, "as_of": str} }
     """
+    windows = ["day", "week", "month", "year"]
+    #the four windows are fetched concurrently (wall time ≈ slowest request, not the sum)
+    futures = [submit(_pool(), get_json, "history", {"window": w}) for w in windows]
+    results = [f.result() for f in futures]
+
     cache = {}
-    for w in ["day", "week", "month", "year"]:
-        js, err = get_json("history", params={"window": w})
+    for w, (js, err) in zip(windows, results):
         if err or not js or "data" not in js:
             return None, f"{w}: {err or 'no data'}"
 
@@ -171,6 +107,9 @@ def refresh_all_histories():
         df["ts"] = pd.to_datetime(df["ts"], utc=True, errors="coerce")
         df["price"] = pd.to_numeric(df.get("price"), errors="coerce")
         df = df.dropna(subset=["ts", "price"]).sort_values("ts").reset_index(drop=True)
+        #'day' keeps only the last 24h, trimmed once here rather than on every rerun
+        if w == "day" and len(df):
+            df = df[df["ts"] >= df["ts"].iloc[-1] - pd.Timedelta(days=1)].reset_index(drop=True)
 
         cache[w] = {
             "df": df,
@@ -195,11 +134,8 @@ st.markdown('<div class="section-header"><h2>Ripple (XRP) Dashboard</h2><p>Fast,
 
 
 
-def _img_b64(path):
-    with open(path, "rb") as f: return base64.b64encode(f.read()).decode()
-
 st.markdown(
-    f"<div style='text-align:center;margin-top:-10px;'><img src='data:image/png;base64,{_img_b64(xrp)}' width='200'></div>",
+    f"<div style='text-align:center;margin-top:-10px;'><img src='{xrp}' width='200'></div>",
     unsafe_allow_html=True
 )
 st.markdown("<br>", unsafe_allow_html=True)
@@ -286,7 +222,7 @@ st.markdown("<br>", unsafe_allow_html=True)
 
 
 ###################################### Price History Chart #####################################
-#----------------------------- visualises Kraken OHLC data with Altair
+#----------------------------- visualises Kraken OHLC data with Vega-Lite
 
 ##retrieve the cached DataFrame for the selected window 
 item = st.session_state.hist_cache.get(window)
@@ -297,11 +233,6 @@ if not item:
 df = item["df"]
 as_of = item.get("as_of", "?")
 
-#for 'day' window, show last 24h only
-if window == "day":
-    cutoff = pd.Timestamp.utcnow() - pd.Timedelta(days=1)
-    df = df[df["ts"] >= cutoff].reset_index(drop=True)
-
 # KPIs
 last_price = float(df["price"].iloc[-1]) if len(df) else np.nan
 prev_price = float(df["price"].iloc[-2]) if len(df) > 1 else np.nan
@@ -315,44 +246,34 @@ c2.metric("Δ vs prev", (f"{pct:+.2f}%" if np.isfinite(pct) else "—"))
 c3.metric("High price", f"${win_high:,.4f}")
 c4.metric("Low price",  f"${win_low:,.4f}")
 
-##format timestamps for tooltips and adjust axis depending on selected window
-df["ts_utc_str"] = df["ts"].dt.strftime("%Y-%m-%d %H:%M UTC")
+##adjust axis depending on selected window
 axis_fmt = "%H:%M, %d %b" if window in ["day", "week"] else "%d %b %Y"
 
-#configure axis encodings
-x_enc = alt.X(
-    "ts:T",
-    title="Time (UTC)",
-    scale=alt.Scale(type="utc"),
-    axis=alt.Axis(format=axis_fmt),
-)
-y_enc = alt.Y("price:Q", title="Price (USD)", scale=alt.Scale(zero=False))
-
-##price line with timestamp and price tooltips
-line = (
-    alt.Chart(df)
-    .mark_line()
-    .encode(x=x_enc, y=y_enc,
-            tooltip=[
-                alt.Tooltip("ts_utc_str:N", title="Timestamp"),
-                alt.Tooltip("price:Q", title="Price (USD)", format="$.4f"),
-            ])
-)
-
-##highlight data values on the same chart
-points = (
-    alt.Chart(df)
-    .mark_point(size=20, filled=True, opacity=0.9)
-    .encode(x=x_enc, y=y_enc,
-            tooltip=[
-                alt.Tooltip("ts_utc_str:N", title="Timestamp"),
-                alt.Tooltip("price:Q", title="Price (USD)", format="$.4f"),
-            ])
-)
-
-##combine both layers, set height and enable interactivity (zoom/pan)
-chart = alt.layer(line, points).properties(height=360).interactive()
-st.altair_chart(chart, use_container_width=True)
+##Vega-Lite spec (line + points, zoom/pan) cached per axis format; the data goes in separately,
+##so reruns skip building and validating an Altair chart
+@st.cache_data(show_spinner=False)
+def price_chart_spec(axis_fmt):
+    x_enc = {"field": "ts", "type": "temporal", "title": "Time (UTC)",
+             "scale": {"type": "utc"}, "axis": {"format": axis_fmt}}
+    y_enc = {"field": "price", "type": "quantitative", "title": "Price (USD)", "scale": {"zero": False}}
+    tooltip = [
+        #formatted by Vega (utc time unit), so no per-row label strings are built or shipped
+        {"field": "ts", "type": "temporal", "timeUnit": "utcyearmonthdatehoursminutes",
+         "title": "Timestamp", "format": "%Y-%m-%d %H:%M UTC"},
+        {"field": "price", "type": "quantitative", "title": "Price (USD)", "format": "$.4f"},
+    ]
+    return {
+        "height": 360,
+        "encoding": {"x": x_enc, "y": y_enc, "tooltip": tooltip},
+        "layer": [
+            #price line; the interval param bound to scales == Altair .interactive()
+            {"mark": "line", "params": [{"name": "zoom", "select": "interval", "bind": "scales"}]},
+            #highlight data values on the same chart
+            {"mark": {"type": "point", "size": 20, "filled": True, "opacity": 0.9}},
+        ],
+    }
+
+st.vega_lite_chart(df[["ts", "price"]], price_chart_spec(axis_fmt), use_container_width=True)
 
 #caption for data source and timestamp
 st.caption(f"as of (UTC): {as_of} • source: Kraken OHLC API")
@@ -389,9 +310,21 @@ with col_pred:
               if _disabled_pred else "Run prediction"),
     ):
         with st.spinner("Predicting…"):
-            pred, err = fetch_predict_cached()
+            try:
+                pred, err = fetch_predict_cached(), None
+            except RuntimeError as e:
+                pred, err = None, str(e)
         if not err and pred and "yhat" in pred:
-            st.session_state.last_prediction = pred
+            ##dates parsed/formatted once here, not on every rerun of the card below
+            as_of_str = pred.get("as_of", "?")
+            try:
+                gen_dt = pd.to_datetime(as_of_str)
+                gen_formatted = gen_dt.strftime("%A, %d %B %Y %H:%M UTC")
+                pred_day = (gen_dt + pd.Timedelta(days=1)).strftime("%A, %d %B %Y")
+            except Exception:
+                gen_formatted = as_of_str
+                pred_day = "Tomorrow"
+            st.session_state.last_prediction = {**pred, "_gen_formatted": gen_formatted, "_pred_day": pred_day}
             st.session_state.last_pred_time = time.time()
         else:
             st.warning("Prediction failed. Please try again in ~30-60 seconds.")
@@ -405,49 +338,10 @@ if pred:
     up = delta >= 0
     delta_colour = "#16a34a" if up else "#dc2626"
     delta_emoji = "▲" if up else "▼"
-    as_of_str = pred.get("as_of", "?")
-    try:
-        gen_dt = pd.to_datetime(as_of_str)
-        gen_formatted = gen_dt.strftime("%A, %d %B %Y %H:%M UTC")
-        pred_day = (gen_dt + pd.Timedelta(days=1)).strftime("%A, %d %B %Y")
-    except Exception:
-        gen_formatted = as_of_str
-        pred_day = "Tomorrow"
-
-    ##custom style for prediction card
-    st.markdown("""
-    <style>
-      .pred-card {
-        border: 1px solid rgba(127,127,127,.25);
-        border-radius: 14px;
-        padding: 18px 22px;
-        margin-top: 10px;
-        background: rgba(127,127,127,.06);
-      }
-      .pred-grid {
-        display: flex; justify-content: space-between; align-items: flex-end; flex-wrap: wrap;
-      }
-      .pred-label {
-        font-size: 0.95rem; opacity: .85; margin: 0;
-      }
-      .pred-value {
-        font-size: 2.6rem; font-weight: 700; margin: 0; line-height: 1;
-      }
-      .pred-chip {
-        font-size: 1rem; padding: 6px 10px; border-radius: 999px;
-        border: 1px solid currentColor; color: inherit;
-        background: transparent; white-space: nowrap;
-      }
-      .pred-info {
-        font-size: 0.9rem; opacity: 0.8; margin-top: 8px; line-height: 1.4;
-      }
-      @media (max-width: 680px){
-        .pred-grid { flex-direction: column; align-items: flex-start; }
-      }
-    </style>
-    """, unsafe_allow_html=True)
-
-    ##render prediction card
+    gen_formatted = pred["_gen_formatted"]
+    pred_day = pred["_pred_day"]
+
+    ##render prediction card (styles: .pred-* in static/ripple.css)
     st.markdown(
         f"""
         <div class="pred-card">
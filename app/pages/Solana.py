@@ -1,100 +1,31 @@
 import os
+import time
+import hashlib
+import orjson
 import requests
+import numpy as np
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
-import altair as alt
 import streamlit as st
+from ui import asset, inject_css, submit
+import plotly.graph_objects as go
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone,date
-import plotly
 
 # Page Setup 
 st.set_page_config(page_title="Solana Dashboard", page_icon="🪙", layout="wide")
 
-st.markdown("""
-<style>
-/* Body & background */
-body {
-    background: linear-gradient(135deg, #1f1c2c, #282843);
-    color: #f0f0f0;
-}
-
-/* Fonts */
-h1, h2, h3 {
-    font-family: 'Poppins', sans-serif;
-}
-p {
-    font-family: 'Roboto', sans-serif;
-    font-size: 1rem;
-    line-height: 1.5rem;
-}
-
-/* Crypto cards */
-.crypto-card {
-    border-radius: 20px;
-    box-shadow: 0 10px 25px rgba(0,0,0,0.4);
-    transition: transform 0.2s;
-    text-align: center;
-    background-color: #2a2a3e;
-    padding: 15px;
-    margin-bottom: 20px;
-}
-.crypto-card:hover {
-    transform: scale(1.05);
-}
-
-/* Images hover effect */
-.crypto-card img {
-    border-radius: 15px;
-    transition: transform 0.3s ease-in-out;
-}
-.crypto-card img:hover {
-    transform: scale(1.05);
-}
-
-/* Buttons */
-.stButton>button {
-    background: linear-gradient(45deg, #ff9900, #ff6600);
-    color: white;
-    font-weight: bold;
-    border-radius: 12px;
-    padding: 8px 16px;
-    transition: all 0.3s ease;
-    width: 100%;
-}
-.stButton>button:hover {
-    transform: translateY(-3px);
-    box-shadow: 0 5px 15px rgba(255, 153, 0, 0.6);
-}
-
-/* Section header */
-.section-header {
-    background-color: #3a3a55;
-    padding: 20px;
-    border-radius: 15px;
-    margin-bottom: 25px;
-    text-align: center;
-}
-.section-header h2 {
-    color: #ff9900;
-    margin: 0;
-}
-.section-header p {
-    color: #ffffff;
-    margin: 5px 0 0 0;
-}
-</style>
-""", unsafe_allow_html=True)
-
-
-
 BASE_DIR = os.path.dirname(__file__)
 APP_DIR = os.path.dirname(BASE_DIR) 
 
+inject_css("dashboard.css")
+
 
 st.markdown('<div class="section-header"><h2>Solana Dashboard</h2><p>A high performance blockchain for decentralized apps</p></div>', unsafe_allow_html=True)
 col1, col2, col3 = st.columns([1, 1, 1])
 with col2:
-    sol = os.path.join(APP_DIR, "assets", "solana.jpg")
-    st.image(sol)
+    st.markdown(f'<img src="{asset("solana.jpg")}" style="max-width:100%">', unsafe_allow_html=True)
 
 
 st.write("""
@@ -104,35 +35,166 @@ with minimal fees. This type of cryptocurrency is particularly popular in gaming
 
 st.markdown("---")
 
+# Shared HTTP session
+@st.cache_resource(show_spinner=False)
+def _http():
+    """One pooled keep-alive session per server process, reused by every API call on this page."""
+    s = requests.Session()
+    # Back off on CoinGecko rate limits / gateway errors; the last response still reaches raise_for_status
+    retry = Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 502, 503],
+                  allowed_methods=["GET"], raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry)
+    s.mount("https://", adapter)
+    s.headers.update({"Accept-Encoding": "gzip"})
+    return s
+
+# On-disk copy of the last CoinGecko responses, so a freshly started server can answer
+# from disk instead of hitting the (rate-limited) API straight away
+CACHE_DIR = os.getenv("CG_CACHE_DIR", os.path.join(APP_DIR, ".cache"))
+
+def _disk_path(key):
+    return os.path.join(CACHE_DIR, hashlib.sha1(repr(key).encode()).hexdigest() + ".json")
+
+def _disk_load(key):
+    try:
+        with open(_disk_path(key), "rb") as f:
+            return orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+
+def _disk_save(key, entry):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = _disk_path(key) + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(orjson.dumps(entry))
+        os.replace(tmp, _disk_path(key))
+    except OSError:
+        pass  # the disk copy is only an optimisation
+
+@st.cache_resource(show_spinner=False)
+def _etag_store():
+    """{(url, params): {"etag", "digest", "t", "data"}} shared across sessions."""
+    return {}
+
+def get_json_conditional(url, params=None, timeout=20, max_age=300):
+    """
+    GET JSON with If-None-Match: when CoinGecko answers 304 Not Modified,
+    reuse the last parsed body instead of downloading and decoding it again.
+    After a restart, a disk copy younger than `max_age` seconds is served without a request.
+    """
+    store = _etag_store()
+    key = (url, tuple(sorted((params or {}).items())))
+    entry = store.get(key)
+    if entry is None:
+        entry = _disk_load(key)
+        if entry is not None:
+            store[key] = entry
+            if time.time() - entry["t"] < max_age:
+                return entry["data"]
+
+    headers = {"If-None-Match": entry["etag"]} if entry and entry.get("etag") else None
+    r = _http().get(url, params=params, headers=headers, timeout=timeout)
+    if r.status_code == 304 and entry is not None:
+        entry["t"] = time.time()
+        _disk_save(key, entry)
+        return entry["data"]
+    r.raise_for_status()
+    digest = hashlib.blake2b(r.content, digest_size=16).hexdigest()
+    if entry is not None and entry.get("digest") == digest:
+        data = entry["data"]  # same bytes as last time: skip the JSON decode
+    else:
+        data = orjson.loads(r.content)
+    entry = {"etag": r.headers.get("ETag"), "digest": digest, "t": time.time(), "data": data}
+    store[key] = entry
+    _disk_save(key, entry)
+    return data
+
+# CoinGecko-compatible base URL; point it at a shared caching proxy to serve all servers from one upstream fetch
+CG_API_BASE = os.getenv("CG_API_BASE", "https://api.coingecko.com/api/v3")
+
 # Helper: Fetch CoinGecko OHLC 
-@st.cache_data(ttl=600)
+@st.cache_data(ttl=600, show_spinner=False)
 def get_sol_ohlc(days: int = 90):
-    url = "https://api.coingecko.com/api/v3/coins/solana/ohlc"
+    """Raises on failure, so an error is not cached (and it runs off the script thread, where st.warning is a no-op)."""
+    url = f"{CG_API_BASE}/coins/solana/ohlc"
     params = {"vs_currency": "usd", "days": days}
+    data = get_json_conditional(url, params=params, timeout=20, max_age=600)
+    # One float64 block straight from the parsed lists (ms timestamps are exact in float64)
+    arr = np.asarray(data, dtype=np.float64).reshape(-1, 5)
+    # Epoch milliseconds reinterpreted as datetime64[ms]: no per-element conversion
+    ts = arr[:, 0].astype(np.int64)
+    df = pd.DataFrame(
+        {
+            "timestamp": pd.DatetimeIndex(ts.view("datetime64[ms]")).tz_localize("UTC"),
+            "open": arr[:, 1],
+            "high": arr[:, 2],
+            "low": arr[:, 3],
+            "close": arr[:, 4],
+        },
+        copy=False,
+    )
+    # CoinGecko already sends candles oldest-first; only sort if that ever changes
+    if not df["timestamp"].is_monotonic_increasing:
+        df = df.sort_values("timestamp").reset_index(drop=True)
+    return df
+
+# Key Market Metrics
+@st.cache_data(ttl=300, show_spinner=False)
+def get_sol_metrics():
+    """Fetch latest Solana market data from CoinGecko (cached for 5 minutes)."""
+    url = f"{CG_API_BASE}/coins/solana"
+    # Only market_data is used; ask CoinGecko to leave out the other (large) sections
+    params = {
+        "localization": "false",
+        "tickers": "false",
+        "community_data": "false",
+        "developer_data": "false",
+        "sparkline": "false",
+    }
+    d = get_json_conditional(url, params=params, timeout=20, max_age=300)["market_data"]
+
+    return {
+        "price": d["current_price"]["usd"],
+        "change_24h": d["price_change_percentage_24h"],
+        "volume": d["total_volume"]["usd"],
+        "market_cap": d["market_cap"]["usd"],
+        "circ_supply": d.get("circulating_supply"),
+        "last_updated": datetime.fromisoformat(d["last_updated"])  # 3.11 parses the trailing Z
+    }
+
+@st.cache_resource
+def _pool():
+    return ThreadPoolExecutor(max_workers=2)
+
+# The CoinGecko requests are independent: start them together so page load waits for the slowest, not the sum
+_f_1y = submit(_pool(), get_sol_ohlc, 365)
+_f_metrics = submit(_pool(), get_sol_metrics)
+
+def _ohlc_result(future):
     try:
-        r = requests.get(url, params=params, timeout=20)
-        r.raise_for_status()
-        data = r.json()
-        df = pd.DataFrame(data, columns=["timestamp", "open", "high", "low", "close"])
-        df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms", utc=True)
-        return df.sort_values("timestamp").reset_index(drop=True)
+        return future.result()
     except Exception as e:
         st.warning(f"Could not fetch OHLC data: {e}")
         return pd.DataFrame()
 
+df_1y = _ohlc_result(_f_1y)
 
-# Fetch both timeframes
-df_3m = get_sol_ohlc(90)
-df_1y = get_sol_ohlc(365)
+# CoinGecko returns the same 4-day candles for days=90 and days=365, so the 3-month chart is the tail of the 1-year one
+if df_1y.empty:
+    df_3m = df_1y
+else:
+    cutoff = df_1y["timestamp"].iloc[-1] - pd.Timedelta(days=90)
+    df_3m = df_1y.loc[df_1y["timestamp"] >= cutoff].reset_index(drop=True)
 
 # Function to create a Plotly candlestick
-def plot_candlestick(df, title):
-    import plotly.graph_objects as go
-
-    if df.empty:
-        st.warning("No data available for this period.")
-        return
-
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _candlestick_fig(days, last_ts, title, _df):
+    """
+    Build the candlestick figure for a `days` window. Keyed on the newest candle
+    timestamp, so reruns reuse the same figure until CoinGecko returns new data.
+    """
+    df = _df
     fig = go.Figure(
         data=[
             go.Candlestick(
@@ -159,7 +221,14 @@ def plot_candlestick(df, title):
         font=dict(family="Arial", size=12, color="black"),
         title_font=dict(size=18, color="black", family="Arial"),
     )
+    return fig
 
+def plot_candlestick(df, days, title):
+    if df.empty:
+        st.warning("No data available for this period.")
+        return
+
+    fig = _candlestick_fig(days, df["timestamp"].iloc[-1], title, df)
     st.plotly_chart(fig, use_container_width=True)
 
 
@@ -180,32 +249,15 @@ st.markdown(
 )
 
 # --- Charts ---
-st.subheader("Solana – Past 3 Months")
-plot_candlestick(df_3m, "")
+# Only the selected window's figure is sent (st.tabs would ship both on every rerun)
+CHART_WINDOWS = {"Past 3 Months": (df_3m, 90), "Past 1 Year": (df_1y, 365)}
+period = st.radio("Period", list(CHART_WINDOWS), horizontal=True, key="sol_period")
 
-st.subheader("Solana – Past 1 Year")
-plot_candlestick(df_1y, "")
+st.subheader(f"Solana – {period}")
+plot_candlestick(*CHART_WINDOWS[period], "")
 
 st.markdown("---")
 
-# Key Market Metrics
-@st.cache_data(ttl=300)
-def get_sol_metrics():
-    """Fetch latest Solana market data from CoinGecko (cached for 5 minutes)."""
-    url = "https://api.coingecko.com/api/v3/coins/solana"
-    r = requests.get(url, timeout=20)
-    r.raise_for_status()
-    d = r.json()["market_data"]
-
-    return {
-        "price": d["current_price"]["usd"],
-        "change_24h": d["price_change_percentage_24h"],
-        "volume": d["total_volume"]["usd"],
-        "market_cap": d["market_cap"]["usd"],
-        "circ_supply": d.get("circulating_supply"),
-        "last_updated": datetime.fromisoformat(d["last_updated"].replace("Z", "+00:00"))
-    }
-
 # Key Market Metrics Display Section 
 
 st.markdown('<div class="section-header"><h2>Key Market Metrics</h2></div>', unsafe_allow_html=True)
@@ -214,93 +266,100 @@ st.write(
     "These live indicators show Solana’s overall market health, combining price, activity, and supply data to help you spot key market trends before generating predictions."
 )
 
-if st.button("Refresh Metrics"):
-    st.cache_data.clear()
-
-try:
-    metrics = get_sol_metrics()
+# A fragment: "Refresh Metrics" reruns just this section, not the charts above
+@st.experimental_fragment
+def metrics_block():
+    refresh = st.button("Refresh Metrics")
 
-    # Helper: Format numbers automatically
-    def fmt_value(val):
-        if val >= 1_000_000_000:
-            return f"${val / 1_000_000_000:,.2f} B"
-        elif val >= 1_000_000:
-            return f"${val / 1_000_000:,.2f} M"
+    try:
+        if refresh:
+            # Only the metrics entry is dropped; the OHLC frames and chart stay cached
+            get_sol_metrics.clear()
+            metrics = get_sol_metrics()
         else:
-            return f"${val:,.2f}"
-
-    # Row 1: Spot Price + 24h Change
-    col1, col2 = st.columns([1, 1])
-    with col1:
-        st.metric(
-            "Spot Price (USD)",
-            f"${metrics['price']:,.2f}",
-            help="Current price of 1 SOL in US dollars."
-        )
+            metrics = _f_metrics.result()
+
+        # Helper: Format numbers automatically (largest tier first)
+        VALUE_TIERS = ((1e9, " B"), (1e6, " M"), (1, ""))
+
+        def fmt_value(val):
+            div, suffix = next(((d, s) for d, s in VALUE_TIERS if val >= d), VALUE_TIERS[-1])
+            return f"${val / div:,.2f}{suffix}"
+
+        # Row 1: Spot Price + 24h Change
+        col1, col2 = st.columns([1, 1])
+        with col1:
+            st.metric(
+                "Spot Price (USD)",
+                f"${metrics['price']:,.2f}",
+                help="Current price of 1 SOL in US dollars."
+            )
+
+        with col2:
+            delta_value = metrics["change_24h"]
+            arrow = "▲" if delta_value > 0 else "▼" if delta_value < 0 else ""
+            color = "green" if delta_value > 0 else "red" if delta_value < 0 else "white"
+            formatted_change = f"{arrow} {abs(delta_value):.2f}%"
+            st.markdown(
+                f"**24h Change (USD)**  \n"
+                f"<span style='font-size:24px; color:{color}; font-weight:700;'>{formatted_change}</span>",
+                unsafe_allow_html=True,
+                help="The percentage change in Solana’s price over the last 24 hours."
+            )
 
-    with col2:
-        delta_value = metrics["change_24h"]
-        arrow = "▲" if delta_value > 0 else "▼" if delta_value < 0 else ""
-        color = "green" if delta_value > 0 else "red" if delta_value < 0 else "white"
-        formatted_change = f"{arrow} {abs(delta_value):.2f}%"
-        st.markdown(
-            f"**24h Change (USD)**  \n"
-            f"<span style='font-size:24px; color:{color}; font-weight:700;'>{formatted_change}</span>",
-            unsafe_allow_html=True,
-            help="The percentage change in Solana’s price over the last 24 hours."
+        # Row 2: Volume + Market Cap 
+        st.markdown("")
+        col3, col4 = st.columns(2)
+        col3.metric(
+            "24h Volume (USD)",
+            fmt_value(metrics["volume"]),
+            help="Total value of all Solana transactions traded in the last 24 hours."
+        )
+        col4.metric(
+            "Market Cap (USD)",
+            fmt_value(metrics["market_cap"]),
+            help="Total market value of all circulating SOL tokens (price × circulating supply)."
         )
 
-    # Row 2: Volume + Market Cap 
-    st.markdown("")
-    col3, col4 = st.columns(2)
-    col3.metric(
-        "24h Volume (USD)",
-        fmt_value(metrics["volume"]),
-        help="Total value of all Solana transactions traded in the last 24 hours."
-    )
-    col4.metric(
-        "Market Cap (USD)",
-        fmt_value(metrics["market_cap"]),
-        help="Total market value of all circulating SOL tokens (price × circulating supply)."
-    )
+        # Row 3: Circulating Supply + Market Health
+        st.markdown("")
+        col5, col6 = st.columns(2)
+        col5.metric(
+            "Circulating Supply",
+            f"{metrics['circ_supply']/1_000_000:,.2f} M SOL",
+            help="The number of SOL tokens currently available for trading and use in the market."
+        )
 
-    # Row 3: Circulating Supply + Market Health
-    st.markdown("")
-    col5, col6 = st.columns(2)
-    col5.metric(
-        "Circulating Supply",
-        f"{metrics['circ_supply']/1_000_000:,.2f} M SOL",
-        help="The number of SOL tokens currently available for trading and use in the market."
-    )
+        # Simple health index logic
+        change = metrics["change_24h"]
+        if change > 1:
+            health = "Bullish"
+            health_color = "green"
+        elif change < -1:
+            health = "Bearish"
+            health_color = "red"
+        else:
+            health = "Stable"
+            health_color = "white"
+
+        # Market Health Index with tooltip + larger label
+        with col6:
+            st.metric(
+                "Market Health Index",
+                "",
+                help="A simplified indicator describing the overall market mood — "
+                     "‘Bullish’ if price trends strongly upward, ‘Bearish’ if downward, or ‘Stable’ if neutral."
+            )
+            st.markdown(
+                f"<div style='font-size:28px; font-weight:700; color:{health_color}; margin-top:-10px;'>{health}</div>",
+                unsafe_allow_html=True,
+            )
+        st.caption(f"Last updated: {metrics['last_updated'].strftime('%Y-%m-%d %H:%M:%S UTC')}")
 
-    # Simple health index logic
-    change = metrics["change_24h"]
-    if change > 1:
-        health = "Bullish"
-        health_color = "green"
-    elif change < -1:
-        health = "Bearish"
-        health_color = "red"
-    else:
-        health = "Stable"
-        health_color = "white"
-
-    # Market Health Index with tooltip + larger label
-    with col6:
-        st.metric(
-            "Market Health Index",
-            "",
-            help="A simplified indicator describing the overall market mood — "
-                 "‘Bullish’ if price trends strongly upward, ‘Bearish’ if downward, or ‘Stable’ if neutral."
-        )
-        st.markdown(
-            f"<div style='font-size:28px; font-weight:700; color:{health_color}; margin-top:-10px;'>{health}</div>",
-            unsafe_allow_html=True,
-        )
-    st.caption(f"Last updated: {metrics['last_updated'].strftime('%Y-%m-%d %H:%M:%S UTC')}")
+    except Exception as e:
+        st.warning(f"Could not fetch Solana metrics: {e}")
 
-except Exception as e:
-    st.warning(f"Could not fetch Solana metrics: {e}")
+metrics_block()
 
 st.markdown("---")
 
@@ -316,6 +375,19 @@ automatically pulled from **CoinGecko**. Click the button below to generate the
 
 predict_url = "https://at3-group23-solana-api.onrender.com/predict/SOL"
 
+def read_streamed_json(response, box):
+    """
+    Read a streamed (stream=True) response chunk by chunk, showing a status line
+    in `box` as soon as the first bytes arrive, then decode the full JSON body.
+    """
+    buf = b""
+    for chunk in response.iter_content(256):
+        if not buf:
+            box.markdown("⏳ Model running…")
+        buf += chunk
+    box.empty()
+    return orjson.loads(buf)
+
 # Big centered button
 col1, col2, col3 = st.columns([1, 3, 1])
 with col2:
@@ -325,9 +397,13 @@ with col2:
 if predict:
     with st.spinner("Fetching latest data and predicting..."):
         try:
-            r = requests.get(predict_url, timeout=25)
-            if r.status_code == 200:
-                data = r.json()
+            with _http().get(predict_url, timeout=25, stream=True) as r:
+                if r.status_code == 200:
+                    data = read_streamed_json(r, st.empty())
+                else:
+                    data = None
+                    error_text = r.text[:300]
+            if data is not None:
 
                 #Compact vertical spacing for immediate result
                 st.write("")  # small space only
@@ -349,6 +425,6 @@ if predict:
                     st.json(data["inputs_used"])
 
             else:
-                st.error(f"API Error {r.status_code}: {r.text[:300]}")
+                st.error(f"API Error {r.status_code}: {error_text}")
         except Exception as e:
             st.error(f"Failed to connect to API: {e}")
\ No newline at end of file
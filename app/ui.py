@@ -0,0 +1,66 @@
+"""Helpers shared by Home and the coin pages (importable because Streamlit puts app/ on sys.path)."""
+import base64
+import hashlib
+import os
+import threading
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+STATIC_DIR = os.path.join(os.path.dirname(__file__), "static")
+
+
+@st.cache_resource
+def _svg_data_uri(name):
+    with open(os.path.join(STATIC_DIR, name), "rb") as f:
+        return "data:image/svg+xml;base64," + base64.b64encode(f.read()).decode()
+
+
+@st.cache_resource
+def _static_version(name):
+    with open(os.path.join(STATIC_DIR, name), "rb") as f:
+        return hashlib.md5(f.read()).hexdigest()[:12]
+
+
+def asset(name):
+    """
+    URL of a file in app/static/, served by Streamlit's static file server so browsers can cache it.
+    The ?v=<content hash> makes that server (a Tornado StaticFileHandler) send a long-lived
+    Cache-Control max-age, since 1.36 has no config option for static headers; an edited file gets a new URL.
+    SVGs are inlined instead, because the static server sends them as text/plain.
+    """
+    if name.endswith(".svg"):
+        return _svg_data_uri(name)
+    return f"app/static/{name}?v={_static_version(name)}"
+
+
+@st.cache_resource
+def _read_css(names):
+    css = ""
+    for name in names:
+        with open(os.path.join(STATIC_DIR, name)) as f:
+            css += f.read()
+    return css
+
+
+def inject_css(*names):
+    """
+    Emit the given app/static/ stylesheets as one <style> block (files are read once per process).
+    Call it on every run: Streamlit drops elements a rerun doesn't re-send, so the styles would vanish.
+    """
+    st.markdown(f"<style>{_read_css(names)}</style>", unsafe_allow_html=True)
+
+
+def submit(pool, fn, *args):
+    """
+    pool.submit(fn, *args) with the current script run's context attached to the worker,
+    so st.cache_data / cache_resource / session_state inside fn behave as on the script thread
+    (a bare pool thread logs "missing ScriptRunContext" on every cache miss).
+    """
+    ctx = get_script_run_ctx()
+
+    def run():
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn(*args)
+
+    return pool.submit(run)